@@ -4,16 +4,39 @@ Built with Streamlit for CISC691 A03
 """
 
 import streamlit as st
+import html
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from dotenv import load_dotenv
-from newsapi import NewsApiClient
-import re
-import glob
+from news_digest_agent import (
+    DigestPipeline, load_config, build_fetcher, render_digest, save_digest
+)
+from summary_cache import SummaryCache
+from digest_archive import DigestArchive
+from article_index import ArticleIndex, highlight_html
 
 # Load environment
 load_dotenv()
 
+DIGESTS_PER_PAGE = 10
+# Most digests kept in the store shared by all sessions (oldest dropped)
+MAX_SHARED_DIGESTS = 50
+
+@st.cache_resource
+def get_archive():
+    """Digest manifest shared by all sessions, synced with the folder once"""
+    archive = DigestArchive(os.getenv('DIGEST_ARCHIVE', 'digest_archive.db'))
+    archive.sync()
+    return archive
+
+@st.cache_resource
+def get_article_index():
+    """Full-text index of sent articles, shared by all sessions"""
+    return ArticleIndex(os.getenv('ARTICLE_INDEX', 'article_index.db'))
+
 # Page config
 st.set_page_config(
     page_title="News Digest Agent",
@@ -21,6 +44,8 @@ st.set_page_config(
     layout="wide"
 )
 
+archive = get_archive()
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -47,32 +72,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Summarization function
-def simple_summarize(text, num_sentences=3):
-    """Extractive summarization"""
-    if not text or len(text) < 50:
-        return "- Content too short to summarize"
-    
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
-    
-    if len(sentences) == 0:
-        return "- No content available"
-    
-    keywords = ['new', 'first', 'launch', 'announce', 'develop', 'create', 
-                'technology', 'ai', 'system', 'company', 'market', 'data',
-                'research', 'study', 'report', 'says', 'according']
-    
-    scored_sentences = []
-    for sentence in sentences:
-        score = sum(1 for keyword in keywords if keyword.lower() in sentence.lower())
-        scored_sentences.append((score, sentence))
-    
-    scored_sentences.sort(reverse=True, key=lambda x: x[0])
-    top_sentences = [s[1] for s in scored_sentences[:num_sentences]]
-    
-    return '\n'.join([f"• {sent.strip()}" for sent in top_sentences])
-
 # Sidebar
 with st.sidebar:
     st.image("https://img.icons8.com/fluency/96/news.png", width=80)
@@ -104,8 +103,7 @@ with st.sidebar:
     
     # Stats
     st.subheader("📊 Stats")
-    digest_files = glob.glob("digest_*.html")
-    st.metric("Past Digests", len(digest_files))
+    st.metric("Past Digests", archive.count())
     st.metric("Topics Tracked", len(topics))
 
 # Main content
@@ -115,165 +113,248 @@ st.markdown("**AI-Powered Personalized News Curation | CISC691 A03 Project**")
 # Tabs
 tab1, tab2, tab3 = st.tabs(["🚀 Generate Digest", "📚 Past Digests", "ℹ️ About"])
 
+# Generated digests, keyed by (topics, max_articles). Streamlit reruns this
+# script on every interaction, so results live in session state (and in
+# a store shared by all sessions) instead of local variables; they expire
+# with the article cache TTL.
+@st.cache_resource
+def shared_digests():
+    """
+    Digests generated by any session: a lock (sessions run on their own
+    threads) and an OrderedDict of key -> (created, summaries), oldest first
+    """
+    return threading.Lock(), OrderedDict()
+
+if 'digests' not in st.session_state:
+    st.session_state.digests = {}
+
+def cached_digest(key, ttl):
+    """(created, summaries) for key if generated within ttl seconds, else None"""
+    entry = st.session_state.digests.get(key)
+    if entry is None:
+        lock, shared = shared_digests()
+        with lock:
+            entry = shared.get(key)
+    if entry and (not ttl or time.time() - entry[0] < ttl):
+        st.session_state.digests[key] = entry
+        return entry
+    return None
+
+def store_digest(key, entry, ttl):
+    """Remember a digest for this session and others, dropping expired ones"""
+    lock, shared = shared_digests()
+    with lock:
+        if ttl:
+            for old_key, (created, _) in list(shared.items()):
+                if time.time() - created >= ttl:
+                    del shared[old_key]
+        shared[key] = entry
+        shared.move_to_end(key)
+        while len(shared) > MAX_SHARED_DIGESTS:
+            shared.popitem(last=False)
+    st.session_state.digests[key] = entry
+
+def show_article(idx, article_data):
+    with st.container():
+        st.markdown(f"""
+        <div class="article-card">
+            <h3>{idx}. {article_data['title']}</h3>
+            <p style="color: #7f8c8d; font-size: 0.9em;">
+                📍 {article_data['source']} | 📅 {article_data['published']}
+            </p>
+            <div style="margin: 15px 0; line-height: 1.8;">
+                {article_data['summary'].replace('- ', '• ').replace(chr(10), '<br>')}
+            </div>
+            <a href="{article_data['url']}" target="_blank" 
+               style="color: #3498db; text-decoration: none; font-weight: bold;">
+                🔗 Read Full Article →
+            </a>
+        </div>
+        """, unsafe_allow_html=True)
+
+def generate_digest(config, fresh=False):
+    """
+    Stream a new digest onto the page and return its summaries
+    (fresh=True skips the article cache and asks NewsAPI again)
+    """
+    fetch_config = dict(config, cache_ttl_minutes=0) if fresh else config
+    pipeline = DigestPipeline(
+        config=config,
+        fetcher=build_fetcher(fetch_config, incremental=False),
+        summary_cache=SummaryCache() if config['summary_cache'] else None,
+        verbose=False
+    )
+    
+    # Progress bar
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    status_text.text("📡 Fetching news articles...")
+    
+    def on_fetched(result, completed, total):
+        if result['error']:
+            st.warning(f"⚠️ Error fetching '{result['topic']}': {result['error']}")
+        status_text.text(f"📡 Fetched {completed}/{total} topics, summarizing as they arrive...")
+    
+    st.markdown("---")
+    st.subheader("📰 Your Digest")
+    
+    # Articles are shown as soon as each one is summarized
+    summaries = []
+    for idx, article_data in enumerate(pipeline.stream(on_fetched=on_fetched), 1):
+        summaries.append(article_data)
+        progress_bar.progress(min(100, int(100 * idx / config['max_articles'])))
+        show_article(idx, article_data)
+    
+    if pipeline.fetcher.cache:
+        cache_stats = pipeline.fetcher.cache.stats()
+        st.caption(f"💾 Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        pipeline.fetcher.cache.close()
+    
+    status_text.text("✅ Digest ready!")
+    progress_bar.progress(100)
+    return summaries
+
 # TAB 1: Generate Digest
 with tab1:
     st.header("Generate Your Personalized Digest")
     
+    config = load_config()
+    config.update(topics=topics, max_articles=max_articles)
+    ttl = config['cache_ttl_minutes'] * 60
+    key = (tuple(topics), max_articles)
+    
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.info(f"📍 Configured for **{len(topics)} topics**: {', '.join(topics[:3])}{'...' if len(topics) > 3 else ''}")
     
     with col2:
-        if st.button("🚀 Generate Digest", type="primary", use_container_width=True):
+        generate = st.button("🚀 Generate Digest", type="primary", use_container_width=True)
+        refresh = st.checkbox("Fetch fresh articles", value=False,
+                              help="Ignore digests and articles cached in the last few minutes")
+    
+    if generate:
+        # ARTICLE_CACHE_TTL_MINUTES=0 turns reuse off, like the article cache
+        entry = None if refresh or not ttl else cached_digest(key, ttl)
+        streamed = entry is None
+        if streamed:
             with st.spinner("🔄 Fetching and processing news..."):
                 try:
-                    # Initialize NewsAPI
-                    news_api = NewsApiClient(api_key=news_api_key)
-                    
-                    # Progress bar
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    # Fetch news
-                    status_text.text("📡 Fetching news articles...")
-                    progress_bar.progress(20)
-                    
-                    all_articles = []
-                    for idx, topic in enumerate(topics):
-                        try:
-                            response = news_api.get_everything(
-                                q=topic,
-                                language='en',
-                                sort_by='publishedAt',
-                                page_size=max_articles
-                            )
-                            articles = response.get('articles', [])
-                            all_articles.extend(articles)
-                            progress_bar.progress(20 + int(30 * (idx + 1) / len(topics)))
-                        except Exception as e:
-                            st.warning(f"⚠️ Error fetching '{topic}': {str(e)}")
-                    
-                    # Deduplicate
-                    status_text.text("🔄 Removing duplicates...")
-                    progress_bar.progress(60)
-                    unique_articles = {art['url']: art for art in all_articles}.values()
-                    articles_list = list(unique_articles)[:max_articles]
-                    
-                    # Summarize
-                    status_text.text("✍️ Generating summaries...")
-                    progress_bar.progress(70)
-                    
-                    summaries = []
-                    for idx, article in enumerate(articles_list):
-                        title = article.get('title', 'No title')
-                        content = article.get('description', '') or article.get('content', '')
-                        url = article.get('url', '#')
-                        source = article.get('source', {}).get('name', 'Unknown')
-                        published = article.get('publishedAt', '')[:10]
-                        
-                        summary = simple_summarize(content, num_sentences=3)
-                        
-                        summaries.append({
-                            'title': title,
-                            'summary': summary,
-                            'url': url,
-                            'source': source,
-                            'published': published
-                        })
-                        
-                        progress_bar.progress(70 + int(25 * (idx + 1) / len(articles_list)))
-                    
-                    status_text.text("✅ Digest ready!")
-                    progress_bar.progress(100)
-                    
-                    # Display results
-                    st.success(f"✅ Generated digest with **{len(summaries)} articles**")
-                    
-                    # Show articles
-                    st.markdown("---")
-                    st.subheader("📰 Your Digest")
-                    
-                    for idx, article_data in enumerate(summaries, 1):
-                        with st.container():
-                            st.markdown(f"""
-                            <div class="article-card">
-                                <h3>{idx}. {article_data['title']}</h3>
-                                <p style="color: #7f8c8d; font-size: 0.9em;">
-                                    📍 {article_data['source']} | 📅 {article_data['published']}
-                                </p>
-                                <div style="margin: 15px 0; line-height: 1.8;">
-                                    {article_data['summary'].replace(chr(10), '<br>')}
-                                </div>
-                                <a href="{article_data['url']}" target="_blank" 
-                                   style="color: #3498db; text-decoration: none; font-weight: bold;">
-                                    🔗 Read Full Article →
-                                </a>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    
-                    # Save option
-                    st.markdown("---")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        if st.button("💾 Save as HTML"):
-                            filename = f"digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-                            # Create HTML (simplified)
-                            html_content = "<html><body><h1>News Digest</h1>"
-                            for art in summaries:
-                                html_content += f"<h2>{art['title']}</h2><p>{art['summary']}</p>"
-                            html_content += "</body></html>"
-                            
-                            with open(filename, 'w', encoding='utf-8') as f:
-                                f.write(html_content)
-                            
-                            st.success(f"✅ Saved to {filename}")
-                    
-                    with col2:
-                        if st.button("📧 Send Email (Coming Soon)"):
-                            st.info("Email integration coming soon!")
-                    
+                    entry = (time.time(), generate_digest(config, fresh=refresh))
+                    store_digest(key, entry, ttl)
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
                     st.exception(e)
+        st.session_state.active_digest = key
+    else:
+        # Any other interaction: keep showing the last digest, without refetching
+        streamed = False
+        active = st.session_state.get('active_digest')
+        entry = cached_digest(active, None) if active else None
+        if entry and active != key:
+            st.caption("⚙️ Topics or article count changed. Click Generate to update this digest.")
+            key = active
+    
+    if entry:
+        created, summaries = entry
+        digest_topics = list(key[0])
+        st.success(f"✅ Generated digest with **{len(summaries)} articles** "
+                   f"at {datetime.fromtimestamp(created).strftime('%I:%M %p')}")
+        
+        if not streamed:
+            st.markdown("---")
+            st.subheader("📰 Your Digest")
+            for idx, article_data in enumerate(summaries, 1):
+                show_article(idx, article_data)
+        
+        # Save option (outside the Generate branch, so its rerun keeps the digest)
+        st.markdown("---")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("💾 Save as HTML"):
+                filename = save_digest(render_digest(summaries, digest_topics), archive=archive,
+                                       topics=digest_topics, article_count=len(summaries))
+                st.success(f"✅ Saved to {filename}")
+        
+        with col2:
+            if st.button("📧 Send Email (Coming Soon)"):
+                st.info("Email integration coming soon!")
 
 # TAB 2: Past Digests
 with tab2:
     st.header("📚 Past Digests")
     
-    digest_files = sorted(glob.glob("digest_*.html"), reverse=True)
+    query = st.text_input("🔎 Search past articles", placeholder="e.g. battery recycling")
+    if query.strip():
+        hits = get_article_index().search(query, limit=20)
+        st.caption(f"{len(hits)} matching articles" + (" (showing the top 20)" if len(hits) == 20 else ""))
+        for hit in hits:
+            st.markdown(f"""
+            <div class="article-card">
+                <h4><a href="{html.escape(hit['url'])}" target="_blank">{html.escape(hit['title'] or 'No title')}</a></h4>
+                <p style="color: #7f8c8d; font-size: 0.9em;">
+                    📍 {html.escape(hit['source'] or '')} | 📅 {html.escape(hit['published'] or '')} | 📄 {html.escape(hit['digest'] or '')}
+                </p>
+                <p>{highlight_html(hit['snippet'])}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        st.markdown("---")
     
-    if digest_files:
-        st.info(f"Found **{len(digest_files)}** past digests")
+    total = archive.count()
+    
+    if total:
+        col1, col2 = st.columns([3, 1])
+        pages = (total + DIGESTS_PER_PAGE - 1) // DIGESTS_PER_PAGE
+        with col1:
+            st.info(f"Found **{total}** past digests")
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
         
-        for file in digest_files[:10]:  # Show last 10
-            file_name = os.path.basename(file)
-            file_time = datetime.strptime(file_name.replace('digest_', '').replace('.html', ''), '%Y%m%d_%H%M%S')
+        for entry in archive.page((page - 1) * DIGESTS_PER_PAGE, DIGESTS_PER_PAGE):
+            file_name = entry['filename']
             
-            col1, col2, col3 = st.columns([3, 1, 1])
+            col1, col2 = st.columns([4, 1])
             
             with col1:
                 st.write(f"📄 **{file_name}**")
-                st.caption(f"Generated: {file_time.strftime('%B %d, %Y at %I:%M %p')}")
+                details = [f"Generated: {entry['created'].strftime('%B %d, %Y at %I:%M %p')}"]
+                if entry['articles'] is not None:
+                    details.append(f"{entry['articles']} articles")
+                if entry['topics']:
+                    details.append(', '.join(entry['topics']))
+                details.append(f"{entry['size'] / 1024:.0f} KB")
+                st.caption(" | ".join(details))
             
             with col2:
-                with open(file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                st.download_button(
-                    "⬇️ Download",
-                    html_content,
-                    file_name=file_name,
-                    mime="text/html"
-                )
-            
-            with col3:
-                if st.button("👁️ View", key=f"view_{file}"):
-                    st.components.v1.html(html_content, height=600, scrolling=True)
+                if st.button("👁️ View", key=f"view_{file_name}"):
+                    st.session_state.viewing = file_name
             
             st.markdown("---")
+        
+        # Only the digest being viewed is read from disk
+        viewing = st.session_state.get('viewing')
+        if viewing:
+            try:
+                html_content = archive.load(viewing)
+            except OSError:
+                st.warning(f"{viewing} is no longer on disk")
+                st.session_state.viewing = None
+                archive.sync()
+            else:
+                st.subheader(f"👁️ {viewing}")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.download_button("⬇️ Download", html_content, file_name=viewing, mime="text/html")
+                with col2:
+                    st.button("✖️ Close", on_click=lambda: st.session_state.update(viewing=None))
+                st.components.v1.html(html_content, height=600, scrolling=True)
     else:
         st.warning("No past digests found. Generate one using the first tab!")
+    
+    if st.button("🔄 Rescan digest folder"):
+        result = archive.sync()
+        st.success(f"Indexed {result['added']} new, removed {result['removed']} missing digests")
 
 # TAB 3: About
 with tab3:
@@ -0,0 +1,151 @@
+"""
+Article Cache - Persistent on-disk cache for NewsAPI responses
+Serves repeated queries from a local SQLite file so digests generated
+within the TTL window don't burn the free-tier request quota.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+
+class ArticleCache:
+    """
+    SQLite-backed cache of article lists keyed by query parameters.
+    Entries expire after `ttl` seconds; when the cache grows past
+    `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_file='article_cache.db', ttl=1800, max_bytes=20 * 1024 * 1024):
+        """
+        Args:
+            cache_file: Path to the SQLite database (created if missing)
+            ttl: Seconds an entry stays fresh
+            max_bytes: Upper bound on total cached payload size
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(**params):
+        """Build a stable cache key from query parameters"""
+        return json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+    def get(self, **params):
+        """
+        Look up cached articles for a query
+
+        Returns:
+            List of articles, or None on a miss or expired entry
+        """
+        key = self.make_key(**params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, size, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            payload, size, created = row
+            if now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(payload)
+
+    def put(self, articles, **params):
+        """Store the articles returned for a query"""
+        key = self.make_key(**params)
+        payload = json.dumps(articles)
+        size = len(payload.encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now)
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed")
+        victims = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': self._total_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,203 @@
+"""
+Article Index - Full-text search over every article sent in a digest
+Summaries are added to a SQLite FTS5 index as digests are saved (one row
+per article URL, updated in place when an article shows up again), so
+"that article about X from last month" is one ranked query instead of
+opening old digest files one by one.
+
+Usage:
+    python article_index.py "battery recycling"
+"""
+
+import argparse
+import html
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    source TEXT,
+    published TEXT,
+    description TEXT,
+    summary TEXT,
+    digest TEXT,
+    topics TEXT,
+    indexed TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, description, source,
+    content='articles', content_rowid='id', tokenize='porter unicode61'
+);
+
+-- Keep the external-content FTS table in step with `articles`
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary, description, source)
+    VALUES (new.id, new.title, new.summary, new.description, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary, description, source)
+    VALUES ('delete', old.id, old.title, old.summary, old.description, old.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary, description, source)
+    VALUES ('delete', old.id, old.title, old.summary, old.description, old.source);
+    INSERT INTO articles_fts (rowid, title, summary, description, source)
+    VALUES (new.id, new.title, new.summary, new.description, new.source);
+END;
+"""
+
+# bm25() column weights: title, summary, description, source
+WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+RANK = f"bm25({', '.join(map(str, WEIGHTS))})"
+
+# Snippet highlight markers (control characters, never in article text)
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, the last
+    one as a prefix (so results show up while typing). Quoting each term
+    keeps punctuation and FTS operators in user input from being parsed.
+    """
+    terms = TERM_RE.findall(text)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def highlight_html(snippet):
+    """Escape a search snippet and turn its match markers into <mark> tags"""
+    return html.escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+class ArticleIndex:
+    """
+    FTS5 index of summary_record() dicts, keyed by article URL.
+    Safe to share between threads (e.g. Streamlit sessions).
+    """
+
+    def __init__(self, index_file='article_index.db'):
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(index_file, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def add(self, records, digest=None, topics=None):
+        """
+        Index the articles of one digest (new URLs are inserted, known
+        ones updated with the latest summary and digest)
+
+        Args:
+            records: summary_record() dicts
+            digest: File name of the digest they were sent in
+            topics: Topics of that digest
+
+        Returns:
+            Number of articles indexed
+        """
+        now = datetime.now().isoformat()
+        topics = ', '.join(topics) if topics else None
+        rows = [
+            (record['url'], record['title'], record['source'], record['published'],
+             record['description'], record['summary'], digest, topics, now)
+            for record in records if record.get('url') and record['url'] != '#'
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO articles (url, title, source, published, description, summary,
+                                      digest, topics, indexed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    title = excluded.title, source = excluded.source,
+                    published = excluded.published, description = excluded.description,
+                    summary = excluded.summary, digest = excluded.digest,
+                    topics = excluded.topics, indexed = excluded.indexed
+            """, rows)
+        return len(rows)
+
+    def search(self, text, limit=20, offset=0):
+        """
+        Ranked full-text search (BM25, title matches weigh most)
+
+        Args:
+            text: Free-text query (see match_query())
+            limit, offset: Paging
+
+        Returns:
+            List of dicts with 'url', 'title', 'source', 'published',
+            'summary', 'digest', 'snippet' (matches wrapped in
+            MARK_START/MARK_END) and 'score' (lower is better)
+        """
+        query = match_query(text)
+        if query is None:
+            return []
+        with self._lock:
+            # ORDER BY rank lets FTS5 sort internally, so snippet() and the
+            # join only run for the rows actually returned
+            rows = self._conn.execute("""
+                SELECT a.url, a.title, a.source, a.published, a.summary, a.digest,
+                       snippet(articles_fts, -1, ?, ?, '…', 16), articles_fts.rank
+                FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+                WHERE articles_fts MATCH ? AND articles_fts.rank MATCH ?
+                ORDER BY articles_fts.rank
+                LIMIT ? OFFSET ?
+            """, (MARK_START, MARK_END, query, RANK, limit, offset)).fetchall()
+        return [{
+            'url': url,
+            'title': title,
+            'source': source,
+            'published': published,
+            'summary': summary,
+            'digest': digest,
+            'snippet': snippet,
+            'score': score
+        } for url, title, source, published, summary, digest, snippet, score in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def optimize(self):
+        """Merge the FTS index segments (worth running after big imports)"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search articles from past digests")
+    parser.add_argument('query', help="words to search for")
+    parser.add_argument('-n', '--limit', type=int, default=10, help="results to show")
+    args = parser.parse_args()
+
+    from news_digest_agent import load_config
+    index = ArticleIndex(load_config()['article_index_file'])
+    try:
+        hits = index.search(args.query, limit=args.limit)
+        print(f"🔎 {len(hits)} results for '{args.query}' ({index.count()} articles indexed)\n")
+        for hit in hits:
+            snippet = hit['snippet'].replace(MARK_START, '[').replace(MARK_END, ']')
+            print(f"• {hit['title']}\n  {hit['source']} | {hit['published']} | {hit['digest']}")
+            print(f"  {snippet}\n  {hit['url']}\n")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
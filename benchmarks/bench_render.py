@@ -0,0 +1,115 @@
+"""
+Benchmark - Digest rendering
+Renders very large digests with the original `html_content += f"..."`
+loop and with the precompiled renderer (HTML and plain text).
+
+Usage:
+    python benchmarks/bench_render.py [num_articles]
+"""
+
+import html
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from renderer import PAGE_START, PAGE_END, render_html, render_text, write_html
+
+WORDS = ("market launch study report growth chip cloud privacy robotics energy "
+         "battery security platform <b>markup</b> & \"quotes\"").split()
+
+
+def make_summaries(count, seed=3):
+    """Synthetic summary_record() dicts"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        sentences = [' '.join(rng.choices(WORDS, k=18)).capitalize() + '.' for _ in range(3)]
+        records.append({
+            'title': ' '.join(rng.choices(WORDS, k=9)).title(),
+            'summary': '\n'.join(f"- {s}" for s in sentences),
+            'url': f"https://example.com/story/{i}?ref=feed&utm_source=x",
+            'source': rng.choice(('TechCrunch', 'The Verge', 'Wired')),
+            'published': '2025-11-03',
+            'description': ' '.join(rng.choices(WORDS, k=30))[:200]
+        })
+    return records
+
+
+def escaped(summaries):
+    """Records with every field HTML-escaped, as a correct renderer must"""
+    return [{key: html.escape(value) for key, value in record.items()} for record in summaries]
+
+
+def legacy_render(summaries, topics, today):
+    """The original string-concatenation renderer (unescaped)"""
+    html_content = PAGE_START + f"""
+            <h1>📰 Your Daily News Digest</h1>
+            <p><strong>📅 Date:</strong> {today}</p>
+            <p><strong>🏷️ Topics:</strong> {', '.join(topics)}</p>
+            <p><strong>📊 Articles:</strong> {len(summaries)}</p>
+            <hr>
+    """
+    for idx, article_data in enumerate(summaries, 1):
+        html_content += f"""
+        <div class="article">
+            <h2><span class="badge">#{idx}</span> {article_data['title']}</h2>
+            <p class="source">📍 {article_data['source']} | 📅 {article_data['published']}</p>
+
+            <div class="preview">
+                <strong>Preview:</strong> {article_data['description']}...
+            </div>
+
+            <div class="summary">
+                <strong>Key Points:</strong>
+                <div style="margin-top: 10px;">
+                    {article_data['summary'].replace('- ', '<p style="margin: 5px 0;">• ')}
+                </div>
+            </div>
+
+            <a href="{article_data['url']}" target="_blank">🔗 Read Full Article →</a>
+        </div>
+        """
+    html_content += PAGE_END
+    return html_content
+
+
+def bench(label, func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"   • {label:<30} {best:8.4f}s  {len(result) / 1e6:7.1f} MB")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    summaries = make_summaries(count)
+    topics = ['artificial intelligence', 'robotics']
+    today = 'November 03, 2025'
+
+    print(f"📊 Render benchmark ({count} articles, best of 3)\n")
+    bench("legacy += concatenation", lambda: legacy_render(summaries, topics, today))
+    bench("legacy += with escaping", lambda: legacy_render(escaped(summaries), topics, today))
+    html_out = bench("render_html (precompiled)", lambda: render_html(summaries, topics, today))
+
+    def stream():
+        buffer = io.StringIO()
+        write_html(summaries, topics, buffer, today)
+        return buffer.getvalue()
+
+    bench("write_html -> StringIO", stream)
+    bench("render_text (plain part)", lambda: render_text(summaries, topics, today))
+
+    print(f"\n   Fields escaped (no raw <b> from content): {'✅' if '<b>markup' not in html_out else '❌'}")
+    print(f"   Streamed output identical: {'✅' if stream() == html_out else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark - Cold start of the CLI and the web app
+Runs fresh interpreters with `python -X importtime` and reports wall
+time, total import time, the slowest direct imports and whether any
+heavy network/email modules were loaded. `--help` and `--render-only`
+should not load NewsAPI or the email stack at all.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+AGENT = str(ROOT / 'news_digest_agent.py')
+
+# (label, interpreter arguments, nesting level of the imports worth listing)
+TARGETS = (
+    ('import news_digest_agent', ['-c', 'import news_digest_agent'], 1),
+    ('CLI --help', [AGENT, '--help'], 0),
+    ('CLI --render-only (offline)', [AGENT, '--render-only'], 0),
+    ('web app imports', ['-c', 'import streamlit, app_imports_probe'], 0),
+)
+
+# Modules that only the network/email stages should load
+HEAVY = ('newsapi', 'requests', 'smtplib', 'ssl', 'email.mime.multipart', 'multiprocessing')
+
+# What app.py imports, minus running the Streamlit script itself
+APP_PROBE = """
+from news_digest_agent import DigestPipeline, load_config, build_fetcher, render_digest, save_digest
+from summary_cache import SummaryCache
+from digest_archive import DigestArchive
+from article_index import ArticleIndex, highlight_html
+"""
+
+# Retained articles for --render-only to serve (it fails without any)
+BENCH_TOPIC = 'technology'
+FETCH_STATE = {'topics': {BENCH_TOPIC: {
+    'latest': '2024-01-01T00:00:00Z',
+    'page_size': 5,
+    'articles': [{
+        'title': f"Benchmark article {i}",
+        'description': "A short description.",
+        'content': "First sentence of the article. Second sentence here. A third one.",
+        'url': f"https://example.com/{i}",
+        'source': {'name': 'Bench'},
+        'publishedAt': '2024-01-01T00:00:00Z'
+    } for i in range(5)]
+}}}
+
+
+def parse_importtime(stderr, level=0):
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        (total self time in ms, {module: cumulative ms} of the imports at
+        nesting `level`, set of every imported module)
+    """
+    total_us = 0
+    direct = {}
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, self_us, cumulative_us, name = line.replace('import time:', '|', 1).split('|')
+        total_us += int(self_us)
+        module = name.strip()
+        modules.add(module)
+        # One space after the separator, then two per nesting level
+        if len(name) - len(name.lstrip(' ')) == 1 + 2 * level:
+            direct[module] = int(cumulative_us) / 1000
+    return total_us / 1000, direct, modules
+
+
+def run_target(args, level, workdir, runs):
+    env = dict(os.environ, NEWS_TOPICS=BENCH_TOPIC, PYTHONPATH=os.pathsep.join(filter(None, [
+        str(ROOT), workdir, os.environ.get('PYTHONPATH')
+    ])))
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=workdir, env=env,
+                              capture_output=True, text=True)
+        wall = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        imports, direct, modules = parse_importtime(proc.stderr, level)
+        if best is None or wall < best[0]:
+            best = (wall, imports, direct, modules)
+    return best
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"🚀 Startup benchmark (best of {runs} cold interpreters)\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Probe module standing in for app.py; output files land in workdir
+        Path(workdir, 'app_imports_probe.py').write_text(APP_PROBE, encoding='utf-8')
+        Path(workdir, 'fetch_state.json').write_text(json.dumps(FETCH_STATE), encoding='utf-8')
+
+        for label, args, level in TARGETS:
+            if 'streamlit' in ' '.join(args) and importlib.util.find_spec('streamlit') is None:
+                print(f"   • {label:<30} skipped (streamlit not installed)\n")
+                continue
+            try:
+                wall, imports, direct, modules = run_target(args, level, workdir, runs)
+            except RuntimeError as e:
+                print(f"   • {label:<30} failed: {e}\n")
+                continue
+
+            heavy = [name for name in HEAVY if name in modules]
+            slowest = sorted(direct.items(), key=lambda item: -item[1])[:5]
+            print(f"   • {label:<30} {wall:7.1f} ms wall   {imports:6.1f} ms imports")
+            print(f"     slowest: {', '.join(f'{name} {ms:.1f}' for name, ms in slowest)}")
+            print(f"     heavy modules: {', '.join(heavy) if heavy else 'none ✅'}\n")
+
+
+if __name__ == "__main__":
+    main()
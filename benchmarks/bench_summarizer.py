@@ -0,0 +1,79 @@
+"""
+Benchmark - Summarizer throughput
+Compares the original per-article simple_summarize loop with the batch
+engines (summarize_batch), serial and across a process pool, on
+thousands of synthetic articles.
+
+Usage:
+    python benchmarks/bench_summarizer.py [num_articles]
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from summarizer import simple_summarize, get_summarizer, summarize_batch
+
+VOCABULARY = (
+    "company announced new artificial intelligence system market data research "
+    "study report according analysts launch developers create technology chip "
+    "cloud revenue growth quarter users privacy regulators model training "
+    "startup investors funding robotics climate energy battery vehicle said "
+    "government policy security breach network software hardware platform"
+).split()
+
+
+def make_articles(count, seed=42):
+    """Generate synthetic article texts of realistic length"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(6, 14)):
+            words = rng.choices(VOCABULARY, k=rng.randint(8, 22))
+            sentences.append(' '.join(words).capitalize())
+        texts.append('. '.join(sentences) + '.')
+    return texts
+
+
+def bench(label, func, texts):
+    start = time.perf_counter()
+    func(texts)
+    elapsed = time.perf_counter() - start
+    print(f"   • {label:<28} {elapsed:8.3f}s  {len(texts) / elapsed:10.0f} articles/s")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    texts = make_articles(count)
+
+    print(f"📊 Summarizer benchmark ({count} articles, 3 sentences each)\n")
+    bench("simple_summarize (loop)", lambda t: [simple_summarize(x, 3) for x in t], texts)
+    for name in ('keyword', 'textrank'):
+        engine = get_summarizer(name)
+        bench(f"summarize_batch ({name})", lambda t: summarize_batch(t, 3, summarizer=engine), texts)
+
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        engine = get_summarizer('textrank')
+        bench(f"textrank, {workers} processes",
+              lambda t: summarize_batch(t, 3, summarizer=engine, workers=workers), texts)
+
+    same = summarize_batch(texts, 3, summarizer=get_summarizer('keyword')) == \
+        [simple_summarize(x, 3) for x in texts]
+    print(f"\n   Keyword batch output identical to simple_summarize: {'✅' if same else '❌'}")
+
+    if workers > 1:
+        engine = get_summarizer('textrank')
+        same = summarize_batch(texts, 3, summarizer=engine, workers=workers) == \
+            summarize_batch(texts, 3, summarizer=engine)
+        print(f"   Parallel textrank output identical to serial: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Deduplication - URL canonicalization and near-duplicate detection
+Syndicated stories reach us under several URLs (tracking parameters,
+mobile hosts, other outlets re-running wire copy). An article is dropped
+when its canonical URL or normalized title was already seen, or when its
+description or title/description word shingles match an earlier
+article's whose title overlaps too (so boilerplate descriptions such as
+aggregator or paywall blurbs don't merge unrelated stories). Candidate
+pairs come from MinHash-LSH banding, so the cost is roughly linear in
+the number of articles rather than quadratic.
+"""
+
+import random
+import re
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from text_utils import tokenize
+
+TRACKING_PARAMS = frozenset([
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'ocid', 'cmpid',
+    'ref', 'ref_src', 'ref_url', 'smid', 'smtyp', 'sr_share', 'taid',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'ncid', 'cid',
+])
+TRACKING_PREFIXES = ('utm_', 'mc_', 'pk_', 'at_', 'itm_')
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+
+# "Headline - Outlet" / "Headline | Outlet" suffixes added by syndicators
+# (only stripped when the suffix names the article's source)
+TITLE_SUFFIX_RE = re.compile(r'\s+[-|–—]\s+([^-|–—]{1,60})$')
+# Titles shorter than this (e.g. "Stocks", "Live updates") aren't matched exactly
+MIN_TITLE_TOKENS = 3
+# Share of title words two articles need in common before a matching
+# description or similar shingles make them the same story
+TITLE_OVERLAP = 0.5
+
+# MinHash signature = BANDS x ROWS bin minimums (one-permutation hashing:
+# every feature is hashed once and lands in one bin; empty bins borrow
+# from the next non-empty one, so short headlines fill every band too).
+# Pairs agreeing on all rows of any band become candidates: ~90% chance
+# at Jaccard 0.7, ~98% at 0.8, and effectively never for unrelated stories.
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+# Candidates are confirmed with the exact Jaccard similarity of shingles
+DEFAULT_SIMILARITY = 0.7
+# Fewer tokens than this are too little text to compare
+MIN_SHINGLE_TOKENS = 6
+
+_MASK64 = (1 << 64) - 1
+_SIGNATURE_SIZE = MINHASH_BANDS * MINHASH_ROWS
+_rng = random.Random(691)
+_HASH_A = _rng.getrandbits(64) | 1
+_HASH_B = _rng.getrandbits(64)
+
+
+def canonicalize_url(url):
+    """
+    Normalize a URL so trivially different links compare equal:
+    scheme, 'www.'/'m.' host prefixes, default ports, fragments, trailing
+    slashes and tracking parameters are dropped; query params are sorted.
+    """
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or '').lower()
+        port = parts.port
+    except ValueError:
+        return url.strip().lower()
+
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = re.sub(r'/+', '/', parts.path).rstrip('/')
+    if path.endswith('/amp'):
+        path = path[:-4]
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def title_tokens(title, source=None):
+    """
+    Title tokens without a trailing " - Outlet" suffix, when the suffix
+    names the article's source (e.g. "... - Reuters" from Reuters).
+    Other dashes are part of the headline ("Stocks - Dow falls ...").
+    """
+    if not title:
+        return []
+    match = TITLE_SUFFIX_RE.search(title)
+    if match and source:
+        suffix, outlet = set(tokenize(match.group(1))), set(tokenize(source))
+        if suffix and outlet and (suffix <= outlet or outlet <= suffix):
+            title = title[:match.start()]
+    return tokenize(title)
+
+
+def normalize_title(title, source=None):
+    """Lowercased title tokens without the source's syndication suffix"""
+    return ' '.join(title_tokens(title, source))
+
+
+def shingles(tokens):
+    """
+    Word and adjacent-word-pair features of a token list, hashed
+
+    Returns:
+        frozenset of ints, or None if there are too few tokens
+    """
+    if len(tokens) < MIN_SHINGLE_TOKENS:
+        return None
+    features = set(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    # Built-in hash() is salted per process, which is fine within one run
+    return frozenset(hash(f) & _MASK64 for f in features)
+
+
+def minhash(features):
+    """
+    One-permutation MinHash signature of a hashed feature set: features
+    are re-hashed once, split into bins by their low bits, and the minimum
+    of each bin is kept. Empty bins are densified by rotation: they take
+    the value of the next non-empty bin (wrapping around), offset by the
+    distance so borrowed values don't match native ones.
+    """
+    signature = [None] * _SIGNATURE_SIZE
+    for h in features:
+        value = (_HASH_A * h + _HASH_B) & _MASK64
+        slot = value % _SIGNATURE_SIZE
+        current = signature[slot]
+        if current is None or value < current:
+            signature[slot] = value
+
+    if None not in signature or not features:
+        return signature
+    dense = []
+    for slot in range(_SIGNATURE_SIZE):
+        distance = 0
+        while signature[(slot + distance) % _SIGNATURE_SIZE] is None:
+            distance += 1
+        dense.append((signature[(slot + distance) % _SIGNATURE_SIZE] + distance * _HASH_A) & _MASK64)
+    return dense
+
+
+def jaccard(a, b):
+    """Exact Jaccard similarity of two sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental duplicate detector. add() returns False for an article
+    that duplicates one already added, True (and indexes it) otherwise.
+    """
+
+    def __init__(self, similarity=DEFAULT_SIMILARITY):
+        """
+        Args:
+            similarity: Jaccard similarity of title+description shingles
+                at or above which two articles are the same story
+        """
+        self.similarity = similarity
+        self._buckets = [{} for _ in range(MINHASH_BANDS)]
+        self._shingles = []
+        self._urls = set()
+        self._title_sets = []
+        self._titles = set()
+        self._descriptions = {}
+        self.dropped = {'url': 0, 'title': 0, 'description': 0, 'similar': 0}
+
+    @staticmethod
+    def _band_keys(signature):
+        """One key (tuple of row values) per band"""
+        return [tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+                for band in range(MINHASH_BANDS)]
+
+    @staticmethod
+    def _titles_overlap(a, b):
+        """True if two title token sets share enough words (or one is empty)"""
+        return not a or not b or jaccard(a, b) >= TITLE_OVERLAP
+
+    def add(self, article):
+        """
+        Index an article unless it duplicates an earlier one
+
+        Returns:
+            True if the article is new, False if it's a duplicate
+        """
+        url = canonicalize_url(article.get('url'))
+        if url and url in self._urls:
+            self.dropped['url'] += 1
+            return False
+
+        tokens = title_tokens(article.get('title'), (article.get('source') or {}).get('name'))
+        title = ' '.join(tokens) if len(tokens) >= MIN_TITLE_TOKENS else ''
+        if title and title in self._titles:
+            self.dropped['title'] += 1
+            return False
+        title_set = frozenset(tokens)
+
+        description_tokens = tokenize(article.get('description') or '')
+        description = ' '.join(description_tokens) if len(description_tokens) >= MIN_SHINGLE_TOKENS else ''
+        if description and any(self._titles_overlap(title_set, other)
+                               for other in self._descriptions.get(description, ())):
+            self.dropped['description'] += 1
+            return False
+
+        features = shingles(tokens + description_tokens)
+
+        if features is not None:
+            band_keys = self._band_keys(minhash(features))
+            checked = set()
+            for band, key in enumerate(band_keys):
+                for other in self._buckets[band].get(key, ()):
+                    if other in checked:
+                        continue
+                    checked.add(other)
+                    if (jaccard(features, self._shingles[other]) >= self.similarity
+                            and self._titles_overlap(title_set, self._title_sets[other])):
+                        self.dropped['similar'] += 1
+                        return False
+
+            position = len(self._shingles)
+            self._shingles.append(features)
+            self._title_sets.append(title_set)
+            for band, key in enumerate(band_keys):
+                self._buckets[band].setdefault(key, []).append(position)
+
+        if url:
+            self._urls.add(url)
+        if title:
+            self._titles.add(title)
+        if description:
+            self._descriptions.setdefault(description, []).append(title_set)
+        return True
+
+
+def dedupe_articles(articles, similarity=DEFAULT_SIMILARITY):
+    """
+    Remove duplicate and near-duplicate articles, keeping the first
+    occurrence of each story (input order is preserved)
+    """
+    index = NearDuplicateIndex(similarity=similarity)
+    return [article for article in articles if index.add(article)]
@@ -0,0 +1,162 @@
+"""
+Digest Archive - Indexed manifest of saved digests
+Every digest written by the agent or the web app is recorded in a small
+SQLite manifest (file, time, topics, article count, size), so listing
+past digests is a paged, indexed query instead of a directory glob, and
+digest bodies are only read from disk when one is viewed or downloaded.
+Digests saved before the archive existed are picked up by sync().
+"""
+
+import glob
+import html
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+FILENAME_RE = re.compile(r'^digest_(\d{8}_\d{6})(?:_(.+))?\.html$')
+TOPICS_RE = re.compile(r'Topics:</strong>\s*([^<]*)<')
+ARTICLE_MARKER = 'class="article"'
+
+
+class DigestArchive:
+    """
+    Manifest of digest HTML files in one directory.
+    Safe to share between threads (e.g. Streamlit sessions).
+    """
+
+    def __init__(self, index_file='digest_archive.db', directory='.'):
+        """
+        Args:
+            index_file: SQLite manifest (created if missing)
+            directory: Folder the digest_*.html files are saved in
+        """
+        self.index_file = index_file
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(index_file, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS digests (
+                filename TEXT PRIMARY KEY,
+                created TEXT NOT NULL,
+                suffix TEXT,
+                topics TEXT,
+                articles INTEGER,
+                size INTEGER
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_digests_created ON digests (created, filename)")
+        self._conn.commit()
+
+    def path_for(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def add(self, filename, topics=None, article_count=None, created=None):
+        """
+        Record a digest that was just written
+
+        Args:
+            filename: Name of the file inside the archive directory
+            topics: Topics shown in the digest
+            article_count: Number of articles in it
+            created: datetime (default: parsed from the file name, or now)
+        """
+        self._insert([self._row(filename, topics, article_count, created)])
+
+    def _row(self, filename, topics, article_count, created=None):
+        match = FILENAME_RE.match(filename)
+        if created is None:
+            created = datetime.strptime(match.group(1), '%Y%m%d_%H%M%S') if match else datetime.now()
+        return (filename, created.isoformat(), match.group(2) if match else None,
+                ', '.join(topics) if topics else None, article_count,
+                os.path.getsize(self.path_for(filename)))
+
+    def _insert(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO digests (filename, created, suffix, topics, articles, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def sync(self):
+        """
+        Reconcile the manifest with the directory: index digest files it
+        doesn't know (reading each once for its topics and article count)
+        and forget files that were deleted
+
+        Returns:
+            Dict with 'added' and 'removed' counts
+        """
+        on_disk = {
+            os.path.basename(path)
+            for path in glob.glob(os.path.join(glob.escape(self.directory), 'digest_*.html'))
+        }
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT filename FROM digests")}
+
+        missing = known - on_disk
+        if missing:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM digests WHERE filename = ?",
+                                       [(name,) for name in missing])
+
+        rows = []
+        for filename in sorted(on_disk - known):
+            if not FILENAME_RE.match(filename):
+                continue
+            with open(self.path_for(filename), 'r', encoding='utf-8', errors='replace') as f:
+                body = f.read()
+            topics = TOPICS_RE.search(body)
+            rows.append(self._row(
+                filename,
+                [html.unescape(t.strip()) for t in topics.group(1).split(',')] if topics else None,
+                body.count(ARTICLE_MARKER)
+            ))
+        if rows:
+            self._insert(rows)
+        return {'added': len(rows), 'removed': len(missing)}
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+
+    def page(self, offset=0, limit=10):
+        """
+        One page of the manifest, newest first
+
+        Returns:
+            List of dicts with 'filename', 'created' (datetime), 'suffix',
+            'topics' (list), 'articles' and 'size'
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, created, suffix, topics, articles, size FROM digests "
+                "ORDER BY created DESC, filename DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [{
+            'filename': filename,
+            'created': datetime.fromisoformat(created),
+            'suffix': suffix,
+            'topics': topics.split(', ') if topics else [],
+            'articles': articles,
+            'size': size
+        } for filename, created, suffix, topics, articles, size in rows]
+
+    def load(self, filename):
+        """Read a digest's HTML (only called when it's viewed or downloaded)"""
+        with open(self.path_for(filename), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def stats(self):
+        with self._lock:
+            digests, total_size, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created), MAX(created) FROM digests"
+            ).fetchone()
+        return {'digests': digests, 'total_size': total_size, 'oldest': oldest, 'newest': newest}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,217 @@
+"""
+Fan-out Digests - One fetch, one summarization pass, many subscribers
+Fetches the union of every subscriber's topics once, ranks the shared
+candidate pool with each user's preference profile, summarizes only the
+distinct articles that made it into someone's digest (once each), then
+renders and delivers a digest per user. Cost grows with the number of
+distinct articles, not with users x articles.
+
+subscribers.json:
+    [
+        {"id": "alice", "email": "alice@example.com",
+         "topics": ["artificial intelligence", "robotics"], "max_articles": 5}
+    ]
+"""
+
+import json
+from collections import defaultdict
+
+from news_digest_agent import (
+    DigestPipeline, load_config, fetch_topics, dedupe_stage, summarize_stage,
+    render_digest, build_message, save_digest, get_outbox, get_archive, get_article_index
+)
+from news_fetcher import merge_results
+from renderer import render_text
+from preference_store import PreferenceStore
+from user_feedback import prepare_articles
+
+
+def load_subscribers(path='subscribers.json', default_max_articles=5):
+    """
+    Read the subscriber list (entries without topics or an email
+    address are skipped)
+
+    Returns:
+        List of dicts with 'id', 'email', 'topics' and 'max_articles'
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    subscribers = []
+    for entry in entries:
+        topics = [t.strip() for t in entry.get('topics', []) if t.strip()]
+        if not topics:
+            continue
+        if not entry.get('email'):
+            print(f"⚠️  Skipping subscriber '{entry.get('id')}': no email address")
+            continue
+        subscribers.append({
+            'id': str(entry.get('id') or entry['email']),
+            'email': entry['email'],
+            'topics': topics,
+            'max_articles': int(entry.get('max_articles', default_max_articles))
+        })
+    return subscribers
+
+def union_topics(subscribers):
+    """Distinct topics of all subscribers, in first-seen order"""
+    return list(dict.fromkeys(topic for sub in subscribers for topic in sub['topics']))
+
+# ═══════════════════════════════════════════════════════════
+#  FAN-OUT STAGES
+#  Same stage names as DigestPipeline; from 'rank' on, data is a dict
+#  keyed by subscriber id
+# ═══════════════════════════════════════════════════════════
+
+def fanout_fetch_stage(_, pipeline):
+    """Fetch the union of all subscribers' topics once"""
+    subscribers = pipeline.subscribers
+    topics = union_topics(subscribers)
+    page_size = max(sub['max_articles'] for sub in subscribers)
+    pipeline.log(f"\n👥 {len(subscribers)} subscribers, {len(topics)} distinct topics")
+
+    fetch_results = fetch_topics(pipeline, topics, page_size)
+
+    # Remember which topics each article was found under
+    pipeline.article_topics = defaultdict(set)
+    for result in fetch_results:
+        for article in result['articles']:
+            pipeline.article_topics[article.get('url')].add(result['topic'])
+    return merge_results(fetch_results)
+
+def fanout_rank_stage(articles, pipeline):
+    """Rank each subscriber's topic slice of the pool with their profile"""
+    if pipeline.preferences is None:
+        config = pipeline.config
+        pipeline.preferences = PreferenceStore(
+            config['profiles_dir'],
+            half_life_days=config.get('feedback_half_life_days') or None,
+            retention_days=config.get('feedback_retention_days') or None
+        )
+
+    # Prepared once, then sliced per topic and shared by every user
+    prepared = prepare_articles(articles)
+    by_topic = defaultdict(list)
+    for position, (_, _, _, url) in enumerate(prepared):
+        for topic in pipeline.article_topics.get(url, ()):
+            by_topic[topic].append(position)
+
+    selections = {}
+    for sub in pipeline.subscribers:
+        positions = sorted({p for topic in sub['topics'] for p in by_topic.get(topic, ())})
+        candidates = [prepared[p] for p in positions]
+        ranked = pipeline.preferences.tracker(sub['id']).rank_prepared(candidates)
+        selections[sub['id']] = [article for _, article in ranked[:sub['max_articles']]]
+
+    slots = sum(len(selected) for selected in selections.values())
+    pipeline.log(f"\n🎯 Personalized {slots} digest slots for {len(selections)} subscribers")
+    return selections
+
+def fanout_summarize_stage(selections, pipeline):
+    """Summarize each distinct selected article once"""
+    distinct = {}
+    for selected in selections.values():
+        for article in selected:
+            distinct.setdefault(article.get('url') or id(article), article)
+
+    records = summarize_stage(list(distinct.values()), pipeline)
+    by_key = dict(zip(distinct, records))
+    return {
+        user_id: [by_key[article.get('url') or id(article)] for article in selected]
+        for user_id, selected in selections.items()
+    }
+
+def fanout_render_stage(summaries, pipeline):
+    """Render one digest per subscriber from the shared summaries"""
+    pipeline.log(f"\n6️⃣ Creating {len(summaries)} email digests...")
+    pipeline.summaries = summaries
+    topics = {sub['id']: sub['topics'] for sub in pipeline.subscribers}
+    return {user_id: render_digest(records, topics[user_id]) for user_id, records in summaries.items()}
+
+def fanout_deliver_stage(digests, pipeline):
+    """
+    Save a backup of each subscriber's digest and queue their email
+
+    Returns:
+        Dict of subscriber id -> {'queued', 'id', 'filename', 'error'}
+    """
+    pipeline.log(f"\n7️⃣ Queueing {len(digests)} emails...")
+    config = pipeline.config
+    emails = {sub['id']: sub['email'] for sub in pipeline.subscribers}
+    topics = {sub['id']: sub['topics'] for sub in pipeline.subscribers}
+    outbox = get_outbox(pipeline)
+    archive = get_archive(pipeline)
+
+    outcomes = {}
+    for user_id, html_content in digests.items():
+        filename = None
+        try:
+            if not emails[user_id]:
+                raise ValueError("no email address")
+            filename = save_digest(html_content, suffix=user_id, archive=archive,
+                                   topics=topics[user_id], article_count=len(pipeline.summaries[user_id]))
+            text_content = render_text(pipeline.summaries[user_id], topics[user_id])
+            message_id = outbox.enqueue(
+                build_message(html_content, config, recipient=emails[user_id],
+                              text_content=text_content), filename
+            )
+            outcomes[user_id] = {'queued': True, 'id': message_id, 'filename': filename, 'error': None}
+        except Exception as e:
+            outcomes[user_id] = {'queued': False, 'id': None, 'filename': filename, 'error': str(e)}
+            pipeline.log(f"   ❌ {user_id}: {e}")
+
+    queued = sum(outcome['queued'] for outcome in outcomes.values())
+    pipeline.log(f"   📮 Queued {queued}/{len(outcomes)} digests (backups saved next to the agent)")
+    return outcomes
+
+def fanout_index_stage(outcomes, pipeline):
+    """Add every subscriber's digest to the full-text search index"""
+    index = get_article_index(pipeline)
+    topics = {sub['id']: sub['topics'] for sub in pipeline.subscribers}
+    indexed = sum(
+        index.add(pipeline.summaries[user_id], digest=outcome['filename'], topics=topics[user_id])
+        for user_id, outcome in outcomes.items() if outcome['filename']
+    )
+    pipeline.log(f"   🔎 Indexed {indexed} articles for search")
+    return outcomes
+
+FANOUT_STAGES = {
+    'fetch': fanout_fetch_stage,
+    'dedupe': dedupe_stage,
+    'rank': fanout_rank_stage,
+    'summarize': fanout_summarize_stage,
+    'render': fanout_render_stage,
+    'deliver': fanout_deliver_stage,
+    'index': fanout_index_stage,
+}
+
+class FanOutPipeline(DigestPipeline):
+    """
+    DigestPipeline producing one digest per subscriber from a single
+    fetch and summarization pass
+    """
+
+    def __init__(self, config=None, subscribers=None, preferences=None, stages=None, **kwargs):
+        """
+        Args:
+            config: Dict from load_config() (loaded lazily if None)
+            subscribers: List from load_subscribers() (read from
+                config['subscribers_file'] if None)
+            preferences: Optional PreferenceStore to reuse
+            stages: Optional dict overriding entries of FANOUT_STAGES
+            **kwargs: Passed to DigestPipeline (fetcher, summary_cache, verbose)
+        """
+        super().__init__(config=config, stages={**FANOUT_STAGES, **(stages or {})}, **kwargs)
+        self.subscribers = subscribers
+        self.preferences = preferences
+        self.article_topics = {}
+
+    def run(self, until=None):
+        if self.subscribers is None:
+            if self.config is None:
+                self.config = load_config()
+            self.subscribers = load_subscribers(self.config['subscribers_file'],
+                                                self.config['max_articles'])
+        if not self.subscribers:
+            raise ValueError("No subscribers with topics to send digests to")
+        return super().run(until=until)
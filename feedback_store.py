@@ -0,0 +1,332 @@
+"""
+Feedback Store - Indexed SQLite storage for FeedbackTracker
+Each interaction is a single-row insert plus score upserts in one
+transaction, so logging costs the same no matter how much history has
+accumulated. History is only read back on demand.
+
+Scores are stored as (lifetime total, decayed value, time of last
+update) so time-decayed scores can be brought up to date without
+replaying interactions. Per-day score changes are aggregated in the
+`daily` table for windowed views. Raw interactions and history older
+than a retention window can be pruned.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT,
+    topic TEXT,
+    source TEXT,
+    sentiment TEXT,
+    action TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_url ON interactions (url, id);
+CREATE INDEX IF NOT EXISTS idx_interactions_timestamp ON interactions (timestamp);
+
+CREATE TABLE IF NOT EXISTS scores (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    decayed REAL NOT NULL DEFAULT 0,
+    updated REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, name)
+);
+
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    delta REAL NOT NULL,
+    PRIMARY KEY (day, kind, name)
+);
+
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    read_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_url ON history (url);
+CREATE INDEX IF NOT EXISTS idx_history_read_date ON history (read_date);
+
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+SOURCE = 'source'
+TOPIC = 'topic'
+
+
+class FeedbackStore:
+    """
+    SQLite backend holding interactions, read history, source/topic scores
+    and metadata for one user.
+    """
+
+    def __init__(self, db_file='user_preferences.db'):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._upgrade_scores()
+        self.conn.executescript(SCHEMA)
+        if self.get_meta('created') is None:
+            self.set_meta('created', datetime.now().isoformat())
+            self.set_meta('total_interactions', '0')
+            self.conn.commit()
+
+    def _upgrade_scores(self):
+        """Add decay columns to a scores table created before they existed"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(scores)")}
+        if columns and 'decayed' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE scores ADD COLUMN decayed REAL NOT NULL DEFAULT 0")
+                self.conn.execute("ALTER TABLE scores ADD COLUMN updated REAL NOT NULL DEFAULT 0")
+                self.conn.execute("UPDATE scores SET decayed = value, updated = ?", (time.time(),))
+
+    # ── metadata ──────────────────────────────────────────────
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def is_empty(self):
+        """True if nothing has been recorded yet"""
+        return self.conn.execute("SELECT 1 FROM interactions LIMIT 1").fetchone() is None \
+            and self.conn.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None
+
+    # ── writes (grouped by the caller inside transaction()) ───
+
+    def transaction(self):
+        """Context manager: commit on success, roll back on error"""
+        return self.conn
+
+    def add_interaction(self, interaction):
+        self.conn.execute(
+            "INSERT INTO interactions (url, topic, source, sentiment, action, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (interaction.get('url'), interaction.get('topic'), interaction.get('source'),
+             interaction.get('sentiment'), interaction.get('action', 'unknown'),
+             interaction.get('timestamp') or datetime.now().isoformat())
+        )
+        self.conn.execute(
+            "UPDATE metadata SET value = CAST(value AS INTEGER) + 1 WHERE key = 'total_interactions'"
+        )
+
+    def add_history(self, url, read_date):
+        self.conn.execute("INSERT INTO history (url, read_date) VALUES (?, ?)", (url, read_date))
+
+    def add_score(self, kind, name, delta):
+        """Add to a score without applying decay (imports and seeding)"""
+        self.conn.execute(
+            "INSERT INTO scores (kind, name, value, decayed, updated) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (kind, name) DO UPDATE SET value = value + excluded.value, "
+            "decayed = decayed + excluded.decayed, updated = excluded.updated",
+            (kind, name, delta, delta, time.time())
+        )
+
+    def delete_scores(self, keys):
+        """Delete score rows given as (kind, name) pairs"""
+        with self.transaction():
+            self.conn.executemany("DELETE FROM scores WHERE kind = ? AND name = ?", keys)
+
+    def touch(self):
+        self.set_meta('last_updated', datetime.now().isoformat())
+
+    def write_batch(self, interactions, history, scores, daily):
+        """
+        Write queued events atomically: either all of them land or none do
+
+        Args:
+            interactions: List of interaction dicts
+            history: List of (url, read_date) tuples
+            scores: Dict of (kind, name) -> (lifetime, decayed, updated),
+                the current state of every score that changed
+            daily: Dict of (day, kind, name) -> (events, summed delta)
+        """
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO interactions (url, topic, source, sentiment, action, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(i.get('url'), i.get('topic'), i.get('source'), i.get('sentiment'),
+                  i.get('action', 'unknown'), i.get('timestamp') or datetime.now().isoformat())
+                 for i in interactions]
+            )
+            self.conn.execute(
+                "UPDATE metadata SET value = CAST(value AS INTEGER) + ? WHERE key = 'total_interactions'",
+                (len(interactions),)
+            )
+            self.conn.executemany("INSERT INTO history (url, read_date) VALUES (?, ?)", history)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scores (kind, name, value, decayed, updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(kind, name, *state) for (kind, name), state in scores.items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO daily (day, kind, name, events, delta) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, kind, name) DO UPDATE SET "
+                "events = events + excluded.events, delta = delta + excluded.delta",
+                [(day, kind, name, events, delta)
+                 for (day, kind, name), (events, delta) in daily.items()]
+            )
+            self.touch()
+
+    def prune(self, cutoff):
+        """
+        Delete interactions, history and daily aggregates older than
+        `cutoff` (ISO timestamp) in one transaction
+
+        Returns:
+            Dict of table -> rows deleted
+        """
+        with self.transaction():
+            deleted = {
+                'interactions': self.conn.execute(
+                    "DELETE FROM interactions WHERE timestamp < ?", (cutoff,)).rowcount,
+                'history': self.conn.execute(
+                    "DELETE FROM history WHERE read_date < ?", (cutoff,)).rowcount,
+                'daily': self.conn.execute(
+                    "DELETE FROM daily WHERE day < ?", (cutoff[:10],)).rowcount
+            }
+            self.set_meta('pruned_before', cutoff)
+        return deleted
+
+    # ── reads ─────────────────────────────────────────────────
+
+    def load_scores(self, kind):
+        """
+        All scores of one kind (small: one row per source/topic)
+
+        Returns:
+            Dict of name -> [lifetime, decayed, updated]
+        """
+        return {
+            name: [value, decayed, updated] for name, value, decayed, updated in
+            self.conn.execute(
+                "SELECT name, value, decayed, updated FROM scores WHERE kind = ?", (kind,)
+            )
+        }
+
+    def window_scores(self, kind, since_day):
+        """Sum of score changes per name from `since_day` (YYYY-MM-DD) on"""
+        return {
+            name: delta for name, delta in self.conn.execute(
+                "SELECT name, SUM(delta) FROM daily WHERE kind = ? AND day >= ? GROUP BY name",
+                (kind, since_day)
+            )
+        }
+
+    def latest_clicks(self):
+        """
+        Source/topic of the most recent click on each URL
+
+        Returns:
+            Dict of url -> (source, topic)
+        """
+        return {
+            url: (source, topic) for url, source, topic in self.conn.execute(
+                "SELECT url, source, topic FROM interactions "
+                "WHERE action = 'clicked' ORDER BY id"
+            )
+        }
+
+    def history_urls(self):
+        """Set of every URL in the read history"""
+        return {row[0] for row in self.conn.execute("SELECT DISTINCT url FROM history")}
+
+    def read_among(self, urls):
+        """Subset of `urls` present in the read history (indexed lookups)"""
+        urls = [url for url in set(urls) if url]
+        found = set()
+        # Query in slices to stay under SQLite's parameter limit
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(
+                row[0] for row in self.conn.execute(
+                    f"SELECT DISTINCT url FROM history WHERE url IN ({placeholders})", chunk
+                )
+            )
+        return found
+
+    def history_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def recent_interactions(self, limit=3):
+        """Most recent interactions, oldest first"""
+        rows = self.conn.execute(
+            "SELECT url, topic, source, sentiment, action, timestamp FROM interactions "
+            "ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._interaction(row) for row in reversed(rows)]
+
+    def iter_interactions(self):
+        """Every interaction, oldest first (streams from disk)"""
+        cursor = self.conn.execute(
+            "SELECT url, topic, source, sentiment, action, timestamp FROM interactions ORDER BY id"
+        )
+        for row in cursor:
+            yield self._interaction(row)
+
+    def iter_history(self):
+        for url, read_date in self.conn.execute("SELECT url, read_date FROM history ORDER BY id"):
+            yield {'url': url, 'read_date': read_date}
+
+    @staticmethod
+    def _interaction(row):
+        url, topic, source, sentiment, action, timestamp = row
+        interaction = {'url': url, 'timestamp': timestamp, 'action': action}
+        if topic is not None:
+            interaction['topic'] = topic
+        if source is not None:
+            interaction['source'] = source
+        if sentiment is not None:
+            interaction['sentiment'] = sentiment
+        return interaction
+
+    # ── migration ─────────────────────────────────────────────
+
+    def import_preferences(self, prefs, origin):
+        """
+        Import a legacy preferences dict (user_preferences.json layout)
+        in one transaction
+
+        Args:
+            prefs: Dict with interactions/source_scores/topic_weights/
+                article_history/metadata
+            origin: Where the data came from (recorded in metadata)
+        """
+        with self.transaction():
+            for interaction in prefs.get('interactions', []):
+                self.add_interaction(interaction)
+            for name, value in prefs.get('source_scores', {}).items():
+                self.add_score(SOURCE, name, value)
+            for name, value in prefs.get('topic_weights', {}).items():
+                self.add_score(TOPIC, name, value)
+            for entry in prefs.get('article_history', []):
+                self.add_history(entry.get('url'), entry.get('read_date') or '')
+
+            metadata = prefs.get('metadata', {})
+            if metadata.get('created'):
+                self.set_meta('created', metadata['created'])
+            if metadata.get('total_interactions') is not None:
+                self.set_meta('total_interactions', str(metadata['total_interactions']))
+            self.set_meta('last_updated', metadata.get('last_updated') or datetime.now().isoformat())
+            self.set_meta('migrated_from', json.dumps({
+                'file': origin,
+                'date': datetime.now().isoformat()
+            }))
+
+    def close(self):
+        self.conn.close()
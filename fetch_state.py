@@ -0,0 +1,101 @@
+"""
+Fetch State - Per-topic high-water marks for incremental fetching
+Remembers the newest publishedAt seen for each topic (plus the articles
+retained from the last run) so scheduled runs only ask NewsAPI for
+articles published since then.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class FetchState:
+    """
+    Persists, per topic:
+        latest    - newest publishedAt seen so far (high-water mark)
+        page_size - page size the retained articles were fetched with
+        articles  - the newest `page_size` articles, merged across runs
+    """
+
+    def __init__(self, state_file='fetch_state.json'):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self.topics = self._load_state()
+
+    def _load_state(self):
+        """Load existing state from file"""
+        if Path(self.state_file).exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                try:
+                    return json.load(f).get('topics', {})
+                except json.JSONDecodeError:
+                    print(f"⚠️  Ignoring corrupt fetch state in {self.state_file}")
+        return {}
+
+    def save(self):
+        """Write state to file (atomically, via a temp file)"""
+        with self._lock:
+            data = {
+                'topics': self.topics,
+                'last_updated': datetime.now().isoformat()
+            }
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            Path(tmp_file).replace(self.state_file)
+
+    def since(self, topic, page_size):
+        """
+        Get the `from` timestamp to request for a topic
+
+        Returns:
+            'YYYY-MM-DDTHH:MM:SS' string, or None if a full fetch is needed
+            (unknown topic, or the page size changed since last run)
+        """
+        with self._lock:
+            entry = self.topics.get(topic)
+            if not entry or entry.get('page_size') != page_size or not entry.get('latest'):
+                return None
+            # NewsAPI accepts second precision without the trailing 'Z'
+            return entry['latest'][:19]
+
+    def merge(self, topic, fetched, page_size, incremental):
+        """
+        Merge newly fetched articles with the ones retained for a topic
+
+        Args:
+            topic: Topic string
+            fetched: Articles returned by NewsAPI for this run
+            page_size: Number of articles to retain
+            incremental: True if `fetched` only holds articles since the
+                high-water mark (otherwise it replaces retained state)
+
+        Returns:
+            The newest `page_size` articles for the topic, newest first
+        """
+        with self._lock:
+            entry = self.topics.get(topic, {})
+            retained = entry.get('articles', []) if incremental else []
+
+            # `from` is inclusive, so the boundary article comes back again
+            seen_urls = {art.get('url') for art in retained}
+            new_articles = [art for art in fetched if art.get('url') not in seen_urls]
+
+            merged = new_articles + retained
+            merged.sort(key=lambda art: art.get('publishedAt') or '', reverse=True)
+            merged = merged[:page_size]
+
+            timestamps = [art.get('publishedAt') or '' for art in merged]
+            if incremental and entry.get('latest'):
+                timestamps.append(entry['latest'])
+            latest = max(timestamps, default='')
+
+            self.topics[topic] = {
+                'latest': latest or None,
+                'page_size': page_size,
+                'articles': merged,
+                'new_count': len(new_articles)
+            }
+            return merged
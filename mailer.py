@@ -0,0 +1,251 @@
+"""
+Mailer - Pooled SMTP delivery
+Keeps authenticated SMTP connections open and reuses them across
+messages, spaces sends to respect a rate limit, and retries transient
+failures (dropped connections, 4xx replies) with exponential backoff.
+Host, port and TLS mode are configurable, so delivery can be exercised
+against a local stand-in server such as
+`python -m aiosmtpd -n -l localhost:8025` (SMTP_SSL=false).
+"""
+
+import queue
+import smtplib
+import threading
+import time
+
+# SMTP errors worth retrying on a fresh connection
+TRANSIENT_SMTP_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+def is_transient(error):
+    """
+    True for failures a retry may fix: dropped or refused connections,
+    4xx replies and network errors. Other SMTP errors (e.g. no supported
+    AUTH method) are permanent; SMTPException subclasses OSError, so it
+    has to be classified before the network-error fallback.
+    """
+    if isinstance(error, TRANSIENT_SMTP_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # No recipients at all (e.g. an empty To header) never succeeds
+        return bool(error.recipients) and all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError)
+
+
+class SmtpMailer:
+    """
+    Thread-safe SMTP sender with a small pool of reusable connections.
+
+    Connections are opened on demand (up to `pool_size` idle ones are
+    kept), checked with NOOP after sitting idle, and recycled after
+    `max_messages_per_connection` messages.
+    """
+
+    def __init__(self, host='smtp.gmail.com', port=465, use_ssl=True, starttls=False,
+                 username=None, password=None, timeout=30, pool_size=2, rate_limit=None,
+                 max_retries=3, backoff=1.0, max_messages_per_connection=100, idle_check=30):
+        """
+        Args:
+            host, port: SMTP server
+            use_ssl: Connect with implicit TLS (SMTP_SSL, port 465)
+            starttls: Upgrade a plain connection with STARTTLS (port 587)
+            username, password: Login credentials (skipped if missing)
+            timeout: Socket timeout in seconds
+            pool_size: Idle connections kept for reuse
+            rate_limit: Max messages per second across all threads (None = no limit)
+            max_retries: Retries per message for transient failures
+            backoff: First retry delay in seconds (doubles each retry)
+            max_messages_per_connection: Reconnect after this many messages
+            idle_check: NOOP a pooled connection idle longer than this (seconds)
+        """
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_check = idle_check
+
+        self._idle = queue.LifoQueue(maxsize=max(1, pool_size))
+        self._rate_lock = threading.Lock()
+        self._next_send = 0.0
+        self._stats_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a mailer from load_config() settings"""
+        return cls(
+            host=config.get('smtp_host', 'smtp.gmail.com'),
+            port=config.get('smtp_port', 465),
+            use_ssl=config.get('smtp_ssl', True),
+            starttls=config.get('smtp_starttls', False),
+            username=config.get('email_sender'),
+            password=config.get('email_password'),
+            rate_limit=config.get('smtp_rate_limit') or None,
+            max_retries=config.get('smtp_max_retries', 3)
+        )
+
+    # ── connections ───────────────────────────────────────────
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        with self._stats_lock:
+            self.connections_opened += 1
+        # [server, messages sent on it, last used]
+        return [server, 0, time.monotonic()]
+
+    def _acquire(self):
+        """Take a live pooled connection, or open a new one"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - conn[2] < self.idle_check:
+                return conn
+            try:
+                if conn[0].noop()[0] == 250:
+                    return conn
+            except Exception:
+                pass
+            self._discard(conn)
+
+    def _release(self, conn):
+        conn[2] = time.monotonic()
+        if conn[1] >= self.max_messages_per_connection:
+            self._discard(conn, polite=True)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn, polite=True)
+
+    @staticmethod
+    def _discard(conn, polite=False):
+        try:
+            if polite:
+                conn[0].quit()
+            else:
+                conn[0].close()
+        except Exception:
+            pass
+
+    def _wait_for_slot(self):
+        """Block until the rate limit allows another message"""
+        if not self.rate_limit:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_send - now
+            self._next_send = max(now, self._next_send) + 1.0 / self.rate_limit
+        if wait > 0:
+            time.sleep(wait)
+
+    # ── sending ───────────────────────────────────────────────
+
+    def send(self, msg):
+        """
+        Send one email.message.Message, retrying transient failures
+
+        Returns:
+            Dict with 'attempts' and 'latency' (seconds, including retries)
+
+        Raises:
+            The last SMTP/network error if every attempt failed
+        """
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._wait_for_slot()
+            conn = None
+            try:
+                conn = self._acquire()
+                conn[0].send_message(msg)
+                conn[1] += 1
+                self._release(conn)
+                break
+            except Exception as e:
+                if conn is not None:
+                    self._discard(conn)
+                if attempt > self.max_retries or not is_transient(e):
+                    with self._stats_lock:
+                        self.failed += 1
+                    raise
+                with self._stats_lock:
+                    self.retries += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+        latency = time.perf_counter() - start
+        with self._stats_lock:
+            self.sent += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+        return {'attempts': attempt, 'latency': latency}
+
+    def send_many(self, messages):
+        """
+        Send several messages over the pooled connection(s)
+
+        Returns:
+            List of dicts with 'sent', 'attempts', 'latency' and 'error',
+            in input order
+        """
+        results = []
+        for msg in messages:
+            start = time.perf_counter()
+            try:
+                outcome = self.send(msg)
+                results.append({'sent': True, 'error': None, **outcome})
+            except Exception as e:
+                results.append({'sent': False, 'attempts': None,
+                                'latency': time.perf_counter() - start, 'error': str(e)})
+        return results
+
+    def stats(self):
+        """Return delivery counters and latency"""
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'retries': self.retries,
+            'connections_opened': self.connections_opened,
+            'avg_latency_ms': self.latency_total * 1000 / self.sent if self.sent else 0.0,
+            'max_latency_ms': self.latency_max * 1000
+        }
+
+    def close(self):
+        """Quit all pooled connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn, polite=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,329 +1,766 @@
 """
 News Digest Agent - FREE VERSION (No OpenAI needed!)
 CISC691 A03 Assignment - Uses extractive summarization
+
+The agent is an importable pipeline: fetch → dedupe → rank → summarize →
+render → deliver → index. Importing this module does no work; call run() or
+execute the file to produce a digest.
+
+Network and storage clients (NewsAPI, SMTP/email, outbox, archive, search
+index) are imported by the stage that first needs them, so `--help`,
+`--render-only` and the web app's archive views start without loading them.
 """
 
+import argparse
 import os
+import time
+from itertools import islice
 from datetime import datetime
 from dotenv import load_dotenv
-from newsapi import NewsApiClient
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import re
+from news_fetcher import NewsFetcher, merge_results
+from summarizer import simple_summarize, get_summarizer, summarize_batch
+from summary_cache import SummaryCache
+from dedupe import NearDuplicateIndex, dedupe_articles
+from text_utils import safe_name
+from renderer import render_html, render_text, write_html
+
+STAGE_NAMES = ('fetch', 'dedupe', 'rank', 'summarize', 'render', 'deliver', 'index')
 
-# Load environment variables
-load_dotenv()
+# Largest default page for DigestPipeline.stream(): summaries share one
+# TF-IDF corpus per page, so digests up to this size summarize exactly
+# like a batch run
+STREAM_PAGE_SIZE = 16
 
-print("🚀 Starting News Digest Agent (Free Version)...")
-print("="*60)
+# ═══════════════════════════════════════════════════════════
+#  CONFIGURATION & CLIENTS
+# ═══════════════════════════════════════════════════════════
 
-def simple_summarize(text, num_sentences=3):
+def load_config():
+    """Load agent configuration from environment variables (.env)"""
+    load_dotenv()
+    return {
+        'news_api_key': os.getenv('NEWS_API_KEY'),
+        'topics': [t.strip() for t in os.getenv('NEWS_TOPICS', 'technology').split(',') if t.strip()],
+        'max_articles': int(os.getenv('MAX_ARTICLES', '5')),
+        'fetch_concurrency': int(os.getenv('FETCH_CONCURRENCY', '8')),
+        'fetch_timeout': float(os.getenv('FETCH_TIMEOUT', '15')),
+        'cache_ttl_minutes': float(os.getenv('ARTICLE_CACHE_TTL_MINUTES', '30')),
+        'incremental_fetch': os.getenv('INCREMENTAL_FETCH', 'true').lower() == 'true',
+        'summarizer': os.getenv('SUMMARIZER', 'keyword'),
+        'summary_workers': int(os.getenv('SUMMARY_WORKERS', '1')),
+        'summary_cache': os.getenv('SUMMARY_CACHE', 'true').lower() == 'true',
+        'feedback_half_life_days': float(os.getenv('FEEDBACK_HALF_LIFE_DAYS', '30')),
+        'feedback_retention_days': float(os.getenv('FEEDBACK_RETENTION_DAYS', '0')),
+        'subscribers_file': os.getenv('SUBSCRIBERS_FILE', 'subscribers.json'),
+        'profiles_dir': os.getenv('PROFILES_DIR', 'user_profiles'),
+        'email_sender': os.getenv('EMAIL_SENDER'),
+        'email_password': os.getenv('EMAIL_PASSWORD'),
+        'email_recipient': os.getenv('EMAIL_RECIPIENT'),
+        'smtp_host': os.getenv('SMTP_HOST', 'smtp.gmail.com'),
+        'smtp_port': int(os.getenv('SMTP_PORT', '465')),
+        'smtp_ssl': os.getenv('SMTP_SSL', 'true').lower() == 'true',
+        'smtp_starttls': os.getenv('SMTP_STARTTLS', 'false').lower() == 'true',
+        'smtp_rate_limit': float(os.getenv('SMTP_RATE_LIMIT', '0')),
+        'smtp_max_retries': int(os.getenv('SMTP_MAX_RETRIES', '3')),
+        'outbox_file': os.getenv('OUTBOX_FILE', 'outbox.db'),
+        'outbox_max_attempts': int(os.getenv('OUTBOX_MAX_ATTEMPTS', '5')),
+        'delivery_workers': int(os.getenv('DELIVERY_WORKERS', '2')),
+        'archive_file': os.getenv('DIGEST_ARCHIVE', 'digest_archive.db'),
+        'article_index_file': os.getenv('ARTICLE_INDEX', 'article_index.db'),
+        'schedule_file': os.getenv('SCHEDULE_FILE', 'schedules.json'),
+        'scheduler_status_file': os.getenv('SCHEDULER_STATUS_FILE', 'scheduler_status.json'),
+        'digest_time': os.getenv('DIGEST_TIME', '07:00'),
+    }
+
+class OfflineNewsApi:
     """
-    Simple extractive summarization - picks most important sentences.
-    No OpenAI needed!
+    Stand-in NewsAPI client for --render-only. Serves the articles the
+    fetch state retained for a topic (merged across incremental runs),
+    falling back to the last full response in the article cache; any
+    other query fails.
     """
-    if not text or len(text) < 50:
-        return "- Article content too short to summarize"
     
-    # Split into sentences
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+    def __init__(self, state=None, cache=None):
+        self.state = state
+        self.cache = cache
     
-    if len(sentences) == 0:
-        return "- No content available"
+    def get_everything(self, **params):
+        entry = self.state.topics.get(params['q']) if self.state is not None else None
+        if entry and entry.get('articles'):
+            return {'articles': entry['articles'][:params['page_size']]}
+        articles = self.cache.get(**params) if self.cache is not None else None
+        if articles is None:
+            raise LookupError("no stored articles (offline, --render-only)")
+        return {'articles': articles}
+
+def build_fetcher(config, incremental=None, offline=False):
+    """
+    Create a NewsFetcher (with cache and fetch state) from configuration
+
+    Args:
+        config: Dict from load_config()
+        incremental: Override config['incremental_fetch'] if not None
+        offline: Serve only articles stored by earlier runs (fetch state,
+            then the article cache with stale entries included) without
+            importing or calling the NewsAPI client
+    """
+    from article_cache import ArticleCache
+    from fetch_state import FetchState
     
-    # Score sentences by keyword importance
-    keywords = ['new', 'first', 'launch', 'announce', 'develop', 'create', 
-                'technology', 'ai', 'system', 'company', 'market', 'data',
-                'research', 'study', 'report', 'says', 'according']
+    if offline:
+        return NewsFetcher(
+            OfflineNewsApi(FetchState(), ArticleCache(ttl=float('inf'))),
+            max_workers=config['fetch_concurrency'],
+            timeout=config['fetch_timeout']
+        )
     
-    scored_sentences = []
-    for sentence in sentences:
-        score = sum(1 for keyword in keywords if keyword.lower() in sentence.lower())
-        scored_sentences.append((score, sentence))
+    from newsapi import NewsApiClient
     
-    # Sort by score and take top N
-    scored_sentences.sort(reverse=True, key=lambda x: x[0])
-    top_sentences = [s[1] for s in scored_sentences[:num_sentences]]
+    if incremental is None:
+        incremental = config['incremental_fetch']
     
-    # Format as bullet points
-    summary = '\n'.join([f"- {sent.strip()}" for sent in top_sentences])
-    return summary
+    news_api = NewsApiClient(api_key=config['news_api_key'])
+    ttl_minutes = config['cache_ttl_minutes']
+    
+    return NewsFetcher(
+        news_api,
+        max_workers=config['fetch_concurrency'],
+        timeout=config['fetch_timeout'],
+        cache=ArticleCache(ttl=ttl_minutes * 60) if ttl_minutes > 0 else None,
+        state=FetchState() if incremental else None
+    )
 
-# Initialize News API
-print("\n1️⃣ Connecting to News API...")
-news_api = NewsApiClient(api_key=os.getenv('NEWS_API_KEY'))
-print("   ✅ News API connected")
+# ═══════════════════════════════════════════════════════════
+#  BUILDING BLOCKS (shared with app.py)
+# ═══════════════════════════════════════════════════════════
 
-print("\n2️⃣ Using FREE extractive summarization (no OpenAI needed)")
-print("   ✅ Summarizer ready")
+def summary_record(article, summary):
+    """
+    Build the dict used by the digest for one article
 
-# Get configuration
-topics = os.getenv('NEWS_TOPICS', 'technology').split(',')
-max_articles = int(os.getenv('MAX_ARTICLES', '5'))
+    Returns:
+        Dict with 'title', 'summary', 'url', 'source', 'published', 'description'
+    """
+    description = article.get('description') or ''
+    return {
+        'title': article.get('title') or 'No title',
+        'summary': summary,
+        'url': article.get('url') or '#',
+        'source': (article.get('source') or {}).get('name') or 'Unknown',
+        'published': (article.get('publishedAt') or '')[:10],
+        'description': description[:200] if description else 'No preview available'
+    }
 
-print(f"\n3️⃣ Configuration:")
-print(f"   Topics: {', '.join(topics)}")
-print(f"   Max articles: {max_articles}")
+def summarize_articles(articles, num_sentences=3, summarizer=None, workers=1, cache=None):
+    """
+    Summarize a batch of articles with one summarizer engine
 
-# Fetch news
-print(f"\n4️⃣ Fetching news articles...")
-all_articles = []
+    Args:
+        articles: List of NewsAPI article dicts
+        num_sentences: Sentences per summary
+        summarizer: Engine from summarizer.get_summarizer() (default: keyword)
+        workers: Worker processes for large batches (1 = serial)
+        cache: Optional SummaryCache consulted before summarizing
 
-for topic in topics:
+    Returns:
+        List of summary_record() dicts, in input order
+    """
+    engine = summarizer or get_summarizer()
+    
     try:
-        response = news_api.get_everything(
-            q=topic.strip(),
-            language='en',
-            sort_by='publishedAt',
-            page_size=max_articles
-        )
-        articles = response.get('articles', [])
-        print(f"   ✅ Found {len(articles)} articles for '{topic.strip()}'")
-        all_articles.extend(articles)
-    except Exception as e:
-        print(f"   ❌ Error fetching '{topic}': {str(e)}")
+        summaries = summarize_batch(articles, num_sentences, summarizer=engine,
+                                    workers=workers, cache=cache)
+    except Exception:
+        # Retry one by one so a single bad article doesn't sink the batch
+        summaries = []
+        for article in articles:
+            try:
+                summaries.append(summarize_batch([article], num_sentences, summarizer=engine,
+                                                 cache=cache)[0])
+            except Exception:
+                summaries.append('- Summary unavailable due to processing error')
+    
+    return [summary_record(article, summary) for article, summary in zip(articles, summaries)]
+
+def summarize_article(article, num_sentences=3, summarizer=None):
+    """Summarize one NewsAPI article into the dict used by the digest"""
+    return summarize_articles([article], num_sentences, summarizer)[0]
+
+def render_digest(summaries, topics, today=None):
+    """
+    Build the HTML email digest
+
+    Args:
+        summaries: List of dicts from summarize_article()
+        topics: Topics shown in the header
+        today: Date string for the header (defaults to today)
+    """
+    return render_html(summaries, topics, today)
+
+def digest_filename(suffix=None):
+    """
+    Timestamped name for a saved digest (digest_YYYYmmdd_HHMMSS[_suffix].html).
+    The suffix is made filesystem-safe, so an id like 'team/bob' can't
+    point outside the digest folder.
+    """
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return f"digest_{stamp}_{safe_name(suffix)}.html" if suffix else f"digest_{stamp}.html"
+
+def save_digest(html_content, suffix=None, archive=None, topics=None, article_count=None):
+    """
+    Write the digest to a timestamped HTML file and return its name
+
+    Args:
+        html_content: Rendered digest
+        suffix: Optional name part (e.g. a user id) so several digests
+            saved in the same second don't overwrite each other
+        archive: Optional DigestArchive to record the file in, together
+            with its topics and article_count
+    """
+    filename = digest_filename(suffix)
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    if archive is not None:
+        archive.add(filename, topics, article_count)
+    return filename
+
+def save_digest_stream(summaries, topics, suffix=None, archive=None):
+    """
+    Render summaries into a timestamped HTML file as they arrive
 
-# Remove duplicates
-unique_articles = {art['url']: art for art in all_articles}.values()
-articles_list = list(unique_articles)[:max_articles]
+    Args:
+        summaries: Iterable of summary_record() dicts (e.g. from
+            DigestPipeline.stream()); each is written before the next
+            one is requested
+        topics: Topics shown in the header
+        archive: Optional DigestArchive to record the file in
 
-print(f"\n📰 Total unique articles to process: {len(articles_list)}")
+    Returns:
+        Name of the file written
+    """
+    filename = digest_filename(suffix)
+    counted = []
+    
+    def count(records):
+        for record in records:
+            counted.append(None)
+            yield record
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        write_html(count(summaries), topics, f)
+    if archive is not None:
+        archive.add(filename, topics, len(counted))
+    return filename
 
-# Summarize articles
-print(f"\n5️⃣ Summarizing articles (extractive method)...")
-summaries = []
+def build_message(html_content, config, recipient=None, text_content=None):
+    """
+    Build the digest email for one recipient (default: EMAIL_RECIPIENT)
 
-for idx, article in enumerate(articles_list, 1):
-    title = article.get('title', 'No title')
-    description = article.get('description', '')
-    content = article.get('content', '')
-    url = article.get('url', '#')
-    source = article.get('source', {}).get('name', 'Unknown')
-    published = article.get('publishedAt', '')[:10]
+    Args:
+        html_content: Rendered HTML digest
+        config: Dict from load_config()
+        recipient: Override for the To address (only None falls back
+            to EMAIL_RECIPIENT)
+        text_content: Optional plain-text version (from render_text())
+    """
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
     
-    print(f"   Processing {idx}/{len(articles_list)}: {title[:50]}...")
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = f"📰 Your Daily News Digest - {datetime.now().strftime('%B %d, %Y')}"
+    msg['From'] = config['email_sender']
+    msg['To'] = config['email_recipient'] if recipient is None else recipient
     
+    # Plain text first: clients show the last alternative they support
+    if text_content:
+        msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
+    msg.attach(MIMEText(html_content, 'html', 'utf-8'))
+    return msg
+
+def send_email(html_content, config, mailer=None):
+    """
+    Send the digest via SMTP (Gmail unless SMTP_HOST says otherwise)
+
+    Args:
+        html_content: Rendered digest
+        config: Dict from load_config()
+        mailer: Optional SmtpMailer to reuse (one is opened and closed
+            for this message otherwise)
+
+    Returns:
+        Dict with 'attempts' and 'latency' from SmtpMailer.send()
+    """
+    from mailer import SmtpMailer
+    
+    msg = build_message(html_content, config)
+    if mailer is not None:
+        return mailer.send(msg)
+    with SmtpMailer.from_config(config) as mailer:
+        return mailer.send(msg)
+
+# ═══════════════════════════════════════════════════════════
+#  PIPELINE STAGES
+#  Each stage is a callable(data, pipeline) -> data
+# ═══════════════════════════════════════════════════════════
+
+def fetch_topics(pipeline, topics, page_size):
+    """
+    Fetch several topics with the pipeline's fetcher, logging per-topic
+    results and cache statistics
+
+    Returns:
+        List of per-topic result dicts from NewsFetcher.fetch_all()
+    """
+    pipeline.log(f"\n4️⃣ Fetching news articles...")
+    
+    if pipeline.fetcher is None:
+        pipeline.log("   🔌 Connecting to News API...")
+        pipeline.fetcher = build_fetcher(pipeline.config)
+    fetcher = pipeline.fetcher
+    fetch_results = fetcher.fetch_all(topics, page_size=page_size)
+    
+    for result in fetch_results:
+        if result['error']:
+            pipeline.log(f"   ❌ Error fetching '{result['topic']}': {result['error']}")
+        else:
+            new_count = fetcher.state.topics[result['topic']]['new_count'] if fetcher.state else len(result['articles'])
+            pipeline.log(f"   ✅ Found {len(result['articles'])} articles for '{result['topic']}' ({new_count} new)")
+    
+    if fetcher.cache:
+        cache_stats = fetcher.cache.stats()
+        pipeline.log(f"   💾 Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    
+    return fetch_results
+
+def fetch_stage(_, pipeline):
+    """Fetch articles for all configured topics"""
+    config = pipeline.config
+    return merge_results(fetch_topics(pipeline, config['topics'], config['max_articles']))
+
+def dedupe_stage(articles, pipeline):
+    """Drop duplicate and near-duplicate (syndicated) articles"""
+    index = NearDuplicateIndex()
+    unique = [article for article in articles if index.add(article)]
+    
+    dropped = ', '.join(f"{count} by {reason}" for reason, count in index.dropped.items() if count)
+    pipeline.log(f"\n📰 Total unique articles: {len(unique)}" + (f" (dropped {dropped})" if dropped else ""))
+    return unique
+
+def rank_stage(articles, pipeline):
+    """Keep the first max_articles articles (fetch order)"""
+    return articles[:pipeline.config['max_articles']]
+
+def personalized_rank_stage(articles, pipeline):
+    """Rank articles with the user's FeedbackTracker preferences"""
+    from user_feedback import FeedbackTracker
+    config = pipeline.config
+    tracker = FeedbackTracker(
+        half_life_days=config.get('feedback_half_life_days') or None,
+        retention_days=config.get('feedback_retention_days') or None
+    )
     try:
-        # Combine description and content for better summaries
-        full_text = f"{description} {content}" if description or content else ""
-        
-        # Generate summary using our free method
-        summary = simple_summarize(full_text, num_sentences=3)
-        
-        summaries.append({
-            'title': title,
-            'summary': summary,
-            'url': url,
-            'source': source,
-            'published': published,
-            'description': description[:200] if description else 'No preview available'
-        })
-        
-        print(f"   ✅ Summarized successfully")
-        
+        return tracker.get_personalized_articles(articles, max_count=pipeline.config['max_articles'])
+    finally:
+        tracker.close()
+
+def summarize_stage(articles, pipeline):
+    """Summarize all articles in one batch (extractive method)"""
+    engine = get_summarizer(pipeline.config['summarizer'])
+    pipeline.log(f"\n5️⃣ Summarizing {len(articles)} articles ({engine.name} extractive method)...")
+    
+    if pipeline.summary_cache is None and pipeline.config['summary_cache']:
+        pipeline.summary_cache = SummaryCache()
+    
+    summaries = summarize_articles(
+        articles,
+        num_sentences=3,
+        summarizer=engine,
+        workers=pipeline.config['summary_workers'],
+        cache=pipeline.summary_cache
+    )
+    
+    pipeline.log(f"   ✅ Summarized {len(summaries)} articles")
+    if pipeline.summary_cache and not engine.batch_dependent:
+        cache_stats = pipeline.summary_cache.stats()
+        pipeline.log(f"   💾 Summary cache hit rate: {cache_stats['hit_rate']:.0%}")
+    return summaries
+
+def render_stage(summaries, pipeline):
+    """Render the HTML digest"""
+    pipeline.log(f"\n6️⃣ Creating email digest...")
+    pipeline.summaries = summaries
+    html_content = render_digest(summaries, pipeline.config['topics'])
+    pipeline.log("   ✅ Digest created")
+    return html_content
+
+def get_outbox(pipeline):
+    """The pipeline's Outbox, opened on first use"""
+    if pipeline.outbox is None:
+        from outbox import Outbox
+        config = pipeline.config
+        pipeline.outbox = Outbox(config['outbox_file'], max_attempts=config['outbox_max_attempts'])
+    return pipeline.outbox
+
+def get_archive(pipeline):
+    """The pipeline's DigestArchive, opened on first use"""
+    if pipeline.archive is None:
+        from digest_archive import DigestArchive
+        pipeline.archive = DigestArchive(pipeline.config['archive_file'])
+    return pipeline.archive
+
+def deliver_stage(html_content, pipeline):
+    """
+    Save a local backup of the digest, then queue the email in the
+    outbox (sending is done by an OutboxWorker, see send_queued()).
+    config['digest_suffix'], if set, is added to the backup's file name.
+
+    Returns:
+        Dict with 'queued' (bool), 'id' (outbox id), 'filename' and 'error'
+    """
+    config = pipeline.config
+    pipeline.log(f"\n7️⃣ Queueing email...")
+    
+    # Backup first, so the digest survives whatever happens to delivery
+    filename = save_digest(html_content, suffix=config.get('digest_suffix'), archive=get_archive(pipeline),
+                           topics=config['topics'], article_count=len(pipeline.summaries))
+    pipeline.log(f"   💾 Backup saved to: {filename}")
+    
+    try:
+        text_content = render_text(pipeline.summaries, config['topics'])
+        message_id = get_outbox(pipeline).enqueue(
+            build_message(html_content, config, text_content=text_content), filename
+        )
+        pipeline.log(f"   📮 Queued for {config['email_recipient']}")
+        return {'queued': True, 'id': message_id, 'filename': filename, 'error': None}
     except Exception as e:
-        print(f"   ⚠️  Error summarizing: {str(e)}")
-        summaries.append({
-            'title': title,
-            'summary': '- Summary unavailable due to processing error',
-            'url': url,
-            'source': source,
-            'published': published,
-            'description': description[:200] if description else 'No preview available'
-        })
-
-# Create HTML digest
-print(f"\n6️⃣ Creating email digest...")
-today = datetime.now().strftime("%B %d, %Y")
-
-html_content = f"""
-<html>
-<head>
-    <style>
-        body {{ 
-            font-family: Arial, sans-serif; 
-            line-height: 1.6; 
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            background-color: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{ 
-            color: #2c3e50; 
-            border-bottom: 3px solid #3498db; 
-            padding-bottom: 10px; 
-            margin-bottom: 20px;
-        }}
-        h2 {{ 
-            color: #34495e; 
-            margin-top: 30px;
-            font-size: 1.3em;
-        }}
-        .article {{ 
-            margin: 25px 0; 
-            padding: 20px; 
-            background: linear-gradient(to right, #f8f9fa 0%, #ffffff 100%); 
-            border-left: 5px solid #3498db;
-            border-radius: 5px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-        }}
-        .source {{ 
-            color: #7f8c8d; 
-            font-size: 0.9em;
-            margin: 10px 0;
-            font-style: italic;
-        }}
-        .preview {{
-            color: #555;
-            font-style: italic;
-            margin: 10px 0;
-            padding: 10px;
-            background: #f0f0f0;
-            border-radius: 3px;
-        }}
-        .summary {{
-            margin: 15px 0;
-            line-height: 1.8;
-            color: #2c3e50;
-        }}
-        .summary li {{
-            margin: 8px 0;
-        }}
-        a {{ 
-            color: #3498db; 
-            text-decoration: none;
-            font-weight: bold;
-            display: inline-block;
-            margin-top: 10px;
-            padding: 8px 15px;
-            background: #ecf0f1;
-            border-radius: 5px;
-            transition: all 0.3s;
-        }}
-        a:hover {{
-            background: #3498db;
-            color: white;
-            transform: translateY(-2px);
-        }}
-        .footer {{
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 2px solid #ddd;
-            color: #7f8c8d;
-            font-size: 0.9em;
-            text-align: center;
-        }}
-        .badge {{
-            display: inline-block;
-            padding: 3px 8px;
-            background: #3498db;
-            color: white;
-            border-radius: 3px;
-            font-size: 0.8em;
-            margin-right: 5px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📰 Your Daily News Digest</h1>
-        <p><strong>📅 Date:</strong> {today}</p>
-        <p><strong>🏷️ Topics:</strong> {', '.join(topics)}</p>
-        <p><strong>📊 Articles:</strong> {len(summaries)}</p>
-        <hr>
-"""
+        pipeline.log(f"   ❌ Error queueing email: {str(e)}")
+        pipeline.log(f"   🌐 Open {filename} in your browser to view the digest")
+        return {'queued': False, 'id': None, 'filename': filename, 'error': str(e)}
 
-for idx, article_data in enumerate(summaries, 1):
-    html_content += f"""
-    <div class="article">
-        <h2><span class="badge">#{idx}</span> {article_data['title']}</h2>
-        <p class="source">📍 {article_data['source']} | 📅 {article_data['published']}</p>
-        
-        <div class="preview">
-            <strong>Preview:</strong> {article_data['description']}...
-        </div>
+def stream_deliver(pipeline, page_size=None):
+    """
+    Streaming counterpart of render + deliver: write each article to the
+    backup file as soon as it is summarized, then queue the email
+
+    Returns:
+        Same dict as deliver_stage()
+    """
+    config = pipeline.config
+    records = []
+    
+    def collect():
+        for record in pipeline.stream(page_size=page_size):
+            records.append(record)
+            pipeline.log(f"   📰 {len(records)}. {record['title']}")
+            yield record
+    
+    filename = save_digest_stream(collect(), config['topics'], suffix=config.get('digest_suffix'),
+                                  archive=get_archive(pipeline))
+    pipeline.summaries = records
+    get_article_index(pipeline).add(records, digest=filename, topics=config['topics'])
+    pipeline.log(f"\n7️⃣ Queueing email...")
+    pipeline.log(f"   💾 Backup saved to: {filename}")
+    
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        message_id = get_outbox(pipeline).enqueue(
+            build_message(html_content, config, text_content=render_text(records, config['topics'])),
+            filename
+        )
+        pipeline.log(f"   📮 Queued for {config['email_recipient']}")
+        return {'queued': True, 'id': message_id, 'filename': filename, 'error': None}
+    except Exception as e:
+        pipeline.log(f"   ❌ Error queueing email: {str(e)}")
+        return {'queued': False, 'id': None, 'filename': filename, 'error': str(e)}
+
+def get_article_index(pipeline):
+    """The pipeline's ArticleIndex, opened on first use"""
+    if pipeline.article_index is None:
+        from article_index import ArticleIndex
+        pipeline.article_index = ArticleIndex(pipeline.config['article_index_file'])
+    return pipeline.article_index
+
+def index_stage(outcome, pipeline):
+    """Add the digest's articles to the full-text search index"""
+    indexed = get_article_index(pipeline).add(pipeline.summaries, digest=outcome['filename'],
+                                              topics=pipeline.config['topics'])
+    pipeline.log(f"   🔎 Indexed {indexed} articles for search")
+    return outcome
+
+def send_queued(pipeline):
+    """
+    Send everything due in the pipeline's outbox with concurrent workers
+
+    Returns:
+        Dict of outbox counts by status afterwards
+    """
+    from mailer import SmtpMailer
+    from outbox import OutboxWorker
+    
+    config = pipeline.config
+    if pipeline.mailer is None:
+        pipeline.mailer = SmtpMailer.from_config(config)
+    pipeline.log(f"\n📮 Sending queued email ({config['delivery_workers']} workers)...")
+    
+    outbox = get_outbox(pipeline)
+    worker = OutboxWorker(outbox, pipeline.mailer, workers=config['delivery_workers'],
+                          log=pipeline.log if pipeline.verbose else None)
+    worker.drain()
+    
+    counts = outbox.stats()
+    pipeline.log(f"   ✅ Sent {worker.sent}, failed {worker.failed} "
+                 f"({counts['pending']} waiting to retry, {counts['failed']} given up)")
+    return counts
+
+# ═══════════════════════════════════════════════════════════
+#  STREAMING
+#  Generator versions of fetch → dedupe → rank → summarize: articles
+#  move on as soon as their topic is fetched, and summaries come out a
+#  page at a time, so memory stays bounded by the page size and the
+#  first articles are ready before the slowest topic has returned
+# ═══════════════════════════════════════════════════════════
+
+def stream_fetch(pipeline, topics, page_size, on_fetched=None):
+    """
+    Yield articles topic by topic, in the order the topics finish
+
+    Args:
+        on_fetched: Optional callback(result, completed, total) per topic
+    """
+    if pipeline.fetcher is None:
+        pipeline.log("   🔌 Connecting to News API...")
+        pipeline.fetcher = build_fetcher(pipeline.config)
+    fetcher = pipeline.fetcher
+    topics = [t.strip() for t in topics if t.strip()]
+    
+    for completed, (_, result) in enumerate(fetcher.iter_fetch(topics, page_size), 1):
+        if result['error']:
+            pipeline.log(f"   ❌ Error fetching '{result['topic']}': {result['error']}")
+        else:
+            pipeline.log(f"   ✅ Found {len(result['articles'])} articles for '{result['topic']}'")
+        if on_fetched:
+            on_fetched(result, completed, len(topics))
+        yield from result['articles']
+
+def stream_unique(articles, index=None):
+    """Yield articles that aren't duplicates of one already yielded"""
+    index = index or NearDuplicateIndex()
+    for article in articles:
+        if index.add(article):
+            yield article
+
+def stream_summaries(articles, pipeline, page_size=STREAM_PAGE_SIZE):
+    """Summarize articles a page at a time, yielding summary_record() dicts"""
+    engine = get_summarizer(pipeline.config['summarizer'])
+    if pipeline.summary_cache is None and pipeline.config['summary_cache']:
+        pipeline.summary_cache = SummaryCache()
+    
+    articles = iter(articles)
+    while True:
+        page = list(islice(articles, page_size))
+        if not page:
+            return
+        yield from summarize_articles(
+            page,
+            num_sentences=3,
+            summarizer=engine,
+            workers=pipeline.config['summary_workers'],
+            cache=pipeline.summary_cache
+        )
+
+DEFAULT_STAGES = {
+    'fetch': fetch_stage,
+    'dedupe': dedupe_stage,
+    'rank': rank_stage,
+    'summarize': summarize_stage,
+    'render': render_stage,
+    'deliver': deliver_stage,
+    'index': index_stage,
+}
+
+class DigestPipeline:
+    """
+    Runs the digest stages in order, timing each one.
+    Any stage can be replaced by passing stages={'name': callable}.
+    """
+    
+    def __init__(self, config=None, stages=None, fetcher=None, summary_cache=None, mailer=None,
+                 outbox=None, archive=None, article_index=None, verbose=True):
+        """
+        Args:
+            config: Dict from load_config() (loaded lazily if None)
+            stages: Optional dict overriding entries of DEFAULT_STAGES
+            fetcher: Optional pre-built NewsFetcher to reuse
+            summary_cache: Optional SummaryCache to reuse
+            mailer: Optional SmtpMailer to reuse
+            outbox: Optional Outbox to queue digests in
+            archive: Optional DigestArchive recording saved digests
+            article_index: Optional ArticleIndex for searching sent articles
+            verbose: Print progress messages
+        """
+        self.config = config
+        self.stages = dict(DEFAULT_STAGES)
+        if stages:
+            unknown = set(stages) - set(STAGE_NAMES)
+            if unknown:
+                raise ValueError(f"Unknown pipeline stages: {', '.join(sorted(unknown))}")
+            self.stages.update(stages)
+        self.fetcher = fetcher
+        self.summary_cache = summary_cache
+        self.mailer = mailer
+        self.outbox = outbox
+        self.archive = archive
+        self.article_index = article_index
+        self.verbose = verbose
+        self.summaries = []
+        self.timings = {}
+    
+    def log(self, message):
+        if self.verbose:
+            print(message)
+    
+    def stream(self, page_size=None, on_fetched=None):
+        """
+        Yield summary_record() dicts as they become ready, instead of
+        running the stages batch by batch
+
+        Articles are kept in arrival order (the 'rank' stage is not used:
+        ranking needs the whole batch), so this is the default pipeline
+        up to 'summarize', streamed.
+
+        Args:
+            page_size: Articles summarized per step (default: max_articles,
+                capped at STREAM_PAGE_SIZE). TextRank weighs sentences by
+                IDF over the page, so small pages give weaker summaries;
+                up to the cap they match the batch pipeline's.
+            on_fetched: Optional callback(result, completed, total) per topic
+        """
+        if self.config is None:
+            self.config = load_config()
+        config = self.config
+        page_size = page_size or max(1, min(config['max_articles'], STREAM_PAGE_SIZE))
         
-        <div class="summary">
-            <strong>Key Points:</strong>
-            <div style="margin-top: 10px;">
-                {article_data['summary'].replace('- ', '<p style="margin: 5px 0;">• ')}
-            </div>
-        </div>
+        self.log(f"\n4️⃣ Streaming articles ({page_size} per summary page)...")
+        start = time.perf_counter()
+        articles = stream_fetch(self, config['topics'], config['max_articles'], on_fetched)
+        selected = islice(stream_unique(articles), config['max_articles'])
+        count = 0
+        try:
+            for record in stream_summaries(selected, self, page_size):
+                count += 1
+                yield record
+        finally:
+            # Stops the fetch generator too (abandoning topics still in flight)
+            articles.close()
+            if self.fetcher is not None and self.fetcher.state is not None:
+                self.fetcher.state.save()
+            self.timings = {'stream': time.perf_counter() - start}
+        self.log(f"   ✅ Streamed {count} articles")
+    
+    def run(self, until=None):
+        """
+        Execute the pipeline
+
+        Args:
+            until: Optional stage name to stop after (e.g. 'render')
+
+        Returns:
+            Output of the last stage executed
+        """
+        if self.config is None:
+            self.config = load_config()
         
-        <a href="{article_data['url']}" target="_blank">🔗 Read Full Article →</a>
-    </div>
-    """
-
-html_content += """
-    <div class="footer">
-        <p><strong>📱 News Digest Agent</strong></p>
-        <p>CISC691 A03 Project | Powered by NewsAPI</p>
-        <p style="margin-top: 10px; font-size: 0.85em;">
-            Using extractive summarization (no API costs!)
-        </p>
-    </div>
-    </div>
-</body>
-</html>
-"""
+        self.timings = {}
+        data = None
+        for name in STAGE_NAMES:
+            start = time.perf_counter()
+            data = self.stages[name](data, self)
+            self.timings[name] = time.perf_counter() - start
+            if name == until:
+                break
+        return data
 
-print("   ✅ Digest created")
+def run(config=None, **kwargs):
+    """Convenience entry point: build a DigestPipeline and run it"""
+    return DigestPipeline(config=config, **kwargs).run()
 
-# Send email
-print(f"\n7️⃣ Sending email...")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and email a news digest")
+    parser.add_argument('--fan-out', action='store_true',
+                        help="one digest per subscriber (fetch and summarize once)")
+    parser.add_argument('--subscribers', metavar='FILE',
+                        help="subscriber list for --fan-out (default: $SUBSCRIBERS_FILE)")
+    parser.add_argument('--stream', action='store_true',
+                        help="summarize and write articles as they arrive (bounded memory)")
+    parser.add_argument('--queue-only', action='store_true',
+                        help="leave emails in the outbox for `python outbox.py` to send")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="generate and save the digest, but don't queue or send email")
+    parser.add_argument('--render-only', action='store_true',
+                        help="like --dry-run, from cached articles only (no NewsAPI calls)")
+    args = parser.parse_args(argv)
+    if args.stream and args.fan_out:
+        parser.error("--stream can't be combined with --fan-out")
+    if (args.dry_run or args.render_only) and (args.fan_out or args.stream):
+        parser.error("--dry-run/--render-only can't be combined with --fan-out or --stream")
+    return args
 
-try:
-    email_sender = os.getenv('EMAIL_SENDER')
-    email_password = os.getenv('EMAIL_PASSWORD')
-    email_recipient = os.getenv('EMAIL_RECIPIENT')
+def main(argv=None):
+    args = parse_args(argv)
+    print("🚀 Starting News Digest Agent (Free Version)...")
+    print("="*60)
     
-    # Create email message
-    msg = MIMEMultipart('alternative')
-    msg['Subject'] = f"📰 Your Daily News Digest - {datetime.now().strftime('%B %d, %Y')}"
-    msg['From'] = email_sender
-    msg['To'] = email_recipient
+    config = load_config()
+    if args.subscribers:
+        config['subscribers_file'] = args.subscribers
     
-    # Attach HTML
-    html_part = MIMEText(html_content, 'html')
-    msg.attach(html_part)
+    print(f"\n1️⃣ Configuration:")
+    if args.fan_out:
+        print(f"   Mode: fan-out ({config['subscribers_file']})")
+    else:
+        print(f"   Topics: {', '.join(config['topics'])}")
+    print(f"   Max articles: {config['max_articles']}")
     
-    # Send via Gmail
-    with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-        server.login(email_sender, email_password)
-        server.send_message(msg)
+    print(f"\n2️⃣ Using FREE extractive summarization: {config['summarizer']} (no OpenAI needed)")
+    get_summarizer(config['summarizer'])
+    print("   ✅ Summarizer ready")
     
-    print("   ✅ Email sent successfully!")
-    print(f"   📧 Check your inbox: {email_recipient}")
-    
-    # Also save to file for backup
-    filename = f"digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print(f"   💾 Backup saved to: {filename}")
+    if args.fan_out:
+        from fanout import FanOutPipeline
+        pipeline = FanOutPipeline(config=config)
+        pipeline.run()
+    elif args.stream:
+        pipeline = DigestPipeline(config=config)
+        stream_deliver(pipeline)
+    elif args.dry_run or args.render_only:
+        # Stops before 'deliver': the email modules are never imported
+        fetcher = build_fetcher(config, offline=True) if args.render_only else None
+        pipeline = DigestPipeline(config=config, fetcher=fetcher)
+        html_content = pipeline.run(until='render')
+        if args.render_only and not pipeline.summaries:
+            raise SystemExit("\n❌ No stored articles for these topics: run once without "
+                             "--render-only to fetch them")
+        filename = save_digest(html_content, archive=get_archive(pipeline),
+                               topics=config['topics'], article_count=len(pipeline.summaries))
+        print(f"\n💾 Digest saved to: {filename} (not emailed)")
+    else:
+        pipeline = DigestPipeline(config=config)
+        pipeline.run()
+    if not (args.queue_only or args.dry_run or args.render_only):
+        send_queued(pipeline)
+        pipeline.mailer.close()
     
-except Exception as e:
-    print(f"   ❌ Error sending email: {str(e)}")
-    print("\n   Saving digest to file instead...")
+    print("\n⏱️  Stage timings:")
+    for name, elapsed in pipeline.timings.items():
+        print(f"   • {name:<10} {elapsed:.2f}s")
     
-    # Save to file as backup
-    filename = f"digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print(f"   💾 Digest saved to: {filename}")
-    print(f"   🌐 Open this file in your browser to view the digest")
-
-print("\n" + "="*60)
-print("✅ News Digest Agent Completed!")
-print("="*60)
-print("\n💡 Note: Using free extractive summarization")
-print("   This picks the most important sentences from articles")
-print("   No OpenAI API costs! ✨")
\ No newline at end of file
+    print("\n" + "="*60)
+    print("✅ News Digest Agent Completed!")
+    print("="*60)
+    print("\n💡 Note: Using free extractive summarization")
+    print("   This picks the most important sentences from articles")
+    print("   No OpenAI API costs! ✨")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+News Fetcher - Concurrent multi-topic retrieval
+Queries NewsAPI for every configured topic in parallel and merges the
+results back in topic order, so a run costs roughly one round-trip
+instead of one per topic.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Used when a request has been submitted but its worker has not started yet
+_POLL_INTERVAL = 0.05
+
+
+class NewsFetcher:
+    """
+    Fetches articles for many topics at once using a bounded thread pool.
+    Each request gets its own timeout, measured from when it starts running.
+    """
+
+    def __init__(self, news_api, max_workers=8, timeout=15,
+                 language='en', sort_by='publishedAt', cache=None, state=None):
+        """
+        Args:
+            news_api: NewsApiClient instance (anything with get_everything)
+            max_workers: Maximum number of requests in flight at once
+            timeout: Seconds to wait for a single topic before giving up
+            language: NewsAPI language filter
+            sort_by: NewsAPI sort order
+            cache: Optional ArticleCache consulted before calling NewsAPI
+            state: Optional FetchState; when given, only articles newer than
+                each topic's high-water mark are requested
+        """
+        self.news_api = news_api
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.language = language
+        self.sort_by = sort_by
+        self.cache = cache
+        self.state = state
+
+    def fetch_topic(self, topic, page_size):
+        """
+        Fetch articles for a single topic (blocking)
+
+        Returns:
+            List of article dicts as returned by NewsAPI
+        """
+        params = {
+            'q': topic,
+            'language': self.language,
+            'sort_by': self.sort_by,
+            'page_size': page_size
+        }
+
+        since = self.state.since(topic, page_size) if self.state is not None else None
+        if since:
+            params['from_param'] = since
+
+        articles = None
+        if self.cache is not None:
+            articles = self.cache.get(**params)
+
+        if articles is None:
+            response = self.news_api.get_everything(**params)
+            articles = response.get('articles', [])
+            if self.cache is not None:
+                self.cache.put(articles, **params)
+
+        if self.state is not None:
+            articles = self.state.merge(topic, articles, page_size, incremental=bool(since))
+        return articles
+
+    def fetch_all(self, topics, page_size, on_result=None):
+        """
+        Fetch all topics concurrently
+
+        Args:
+            topics: Iterable of topic strings
+            page_size: Articles requested per topic
+            on_result: Optional callback(result, completed, total), called
+                from the calling thread as each topic finishes
+
+        Returns:
+            List of result dicts in the same order as `topics`, each with
+            'topic', 'articles', 'error' (None on success) and 'elapsed'
+        """
+        topics = [t.strip() for t in topics if t.strip()]
+        results = [None] * len(topics)
+        for completed, (idx, result) in enumerate(self.iter_fetch(topics, page_size), 1):
+            results[idx] = result
+            if on_result:
+                on_result(result, completed, len(topics))
+        return results
+
+    def iter_fetch(self, topics, page_size):
+        """
+        Fetch all topics concurrently, yielding each result as soon as its
+        topic finishes (so callers can start processing before the
+        slowest topic is back)
+
+        Yields:
+            (index into topics, result dict) in completion order; the
+            result dict is the same as in fetch_all()
+        """
+        topics = [t.strip() for t in topics if t.strip()]
+        if not topics:
+            return
+
+        started = {}
+        lock = threading.Lock()
+
+        def run(index, topic):
+            with lock:
+                started[index] = time.monotonic()
+            return self.fetch_topic(topic, page_size)
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(topics)),
+            thread_name_prefix='news-fetch'
+        )
+        try:
+            pending = {
+                executor.submit(run, idx, topic): idx
+                for idx, topic in enumerate(topics)
+            }
+
+            while pending:
+                now = time.monotonic()
+                with lock:
+                    deadlines = [
+                        started[idx] + self.timeout
+                        for idx in pending.values() if idx in started
+                    ]
+                wait_for = max(0, min(deadlines) - now) if deadlines else _POLL_INTERVAL
+
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                finished = []
+                for future in done:
+                    idx = pending.pop(future)
+                    elapsed = time.monotonic() - started.get(idx, now)
+                    try:
+                        result = self._result(topics[idx], future.result(), None, elapsed)
+                    except Exception as e:
+                        result = self._result(topics[idx], [], str(e), elapsed)
+                    finished.append((idx, result))
+
+                # Abandon requests that have run past their own deadline
+                now = time.monotonic()
+                with lock:
+                    expired = [
+                        (future, idx) for future, idx in pending.items()
+                        if idx in started and now - started[idx] >= self.timeout
+                    ]
+                for future, idx in expired:
+                    pending.pop(future)
+                    future.cancel()
+                    finished.append((idx, self._result(
+                        topics[idx], [], f"timed out after {self.timeout}s", now - started[idx]
+                    )))
+
+                yield from sorted(finished, key=lambda x: x[0])
+        finally:
+            # Don't block on abandoned (timed out) requests
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.state is not None:
+            self.state.save()
+
+    @staticmethod
+    def _result(topic, articles, error, elapsed):
+        return {
+            'topic': topic,
+            'articles': articles,
+            'error': error,
+            'elapsed': elapsed
+        }
+
+
+def merge_results(results):
+    """
+    Flatten per-topic results into a single article list, preserving
+    topic order and the order NewsAPI returned articles within each topic
+    """
+    all_articles = []
+    for result in results:
+        all_articles.extend(result['articles'])
+    return all_articles
@@ -0,0 +1,281 @@
+"""
+Outbox - Durable delivery queue for rendered digests
+The pipeline writes each finished email into a SQLite outbox and moves
+on; OutboxWorker threads drain it through an SmtpMailer. A message is
+claimed with a lease before sending, so if the process dies mid-send the
+lease expires and the message is picked up again (delivery is
+at-least-once). Failed sends are retried later with growing delays.
+
+Usage:
+    python outbox.py            # send everything that's due, then exit
+    python outbox.py --watch    # keep running and send as messages arrive
+"""
+
+import argparse
+import email
+import sqlite3
+import threading
+import time
+from email import policy
+
+from mailer import SmtpMailer, is_transient
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class Outbox:
+    """
+    SQLite-backed message queue. Safe to share between threads and
+    between processes (e.g. the agent enqueueing while a separate
+    `python outbox.py --watch` sends).
+    """
+
+    def __init__(self, outbox_file='outbox.db', lease_seconds=300, max_attempts=5,
+                 retry_backoff=60):
+        """
+        Args:
+            outbox_file: Path to the SQLite database (created if missing)
+            lease_seconds: How long a claimed message may take before
+                another worker may take it over
+            max_attempts: Send attempts before a message is marked failed
+            retry_backoff: Delay before the first retry in seconds
+                (doubles with each attempt)
+        """
+        self.outbox_file = outbox_file
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(outbox_file, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recipient TEXT,
+                subject TEXT,
+                message BLOB NOT NULL,
+                filename TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                lease_until REAL,
+                last_error TEXT,
+                latency REAL,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt)")
+        self._conn.commit()
+
+    def enqueue(self, msg, filename=None):
+        """
+        Durably queue an email.message.Message for sending
+
+        Args:
+            msg: Message to send (its To header is shown in stats/logs)
+            filename: Local backup of the digest, for reference
+
+        Returns:
+            Outbox id of the message
+
+        Raises:
+            ValueError: If the message has no To address (it could never
+                be delivered, only retried)
+        """
+        if not str(msg['To'] or '').strip():
+            raise ValueError("Message has no To address (is EMAIL_RECIPIENT set?)")
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (recipient, subject, message, filename, status, "
+                "next_attempt, created, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (msg['To'], msg['Subject'], msg.as_bytes(), filename, PENDING, now, now, now)
+            )
+        return cursor.lastrowid
+
+    def claim(self):
+        """
+        Lease the oldest due message (pending, or sending with an expired
+        lease from a worker that died)
+
+        Returns:
+            (id, email.message.Message) or None if nothing is due
+        """
+        now = time.time()
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    "SELECT id, message FROM outbox WHERE "
+                    "(status = ? AND next_attempt <= ?) OR (status = ? AND lease_until < ?) "
+                    "ORDER BY id LIMIT 1",
+                    (PENDING, now, SENDING, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                with self._conn:
+                    # Conditional update: loses cleanly if another process claimed it first
+                    claimed = self._conn.execute(
+                        "UPDATE outbox SET status = ?, lease_until = ?, attempts = attempts + 1, "
+                        "updated = ? WHERE id = ? AND (status = ? OR (status = ? AND lease_until < ?))",
+                        (SENDING, now + self.lease_seconds, now, row[0], PENDING, SENDING, now)
+                    ).rowcount
+                if claimed:
+                    return row[0], email.message_from_bytes(row[1], policy=policy.SMTP)
+
+    def mark_sent(self, message_id, latency=None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, lease_until = NULL, last_error = NULL, "
+                "latency = ?, updated = ? WHERE id = ?",
+                (SENT, latency, now, message_id)
+            )
+
+    def mark_failed(self, message_id, error, retry=True):
+        """
+        Record a failed attempt: schedule a retry (with backoff) unless
+        `retry` is False or max_attempts is used up
+
+        Returns:
+            True if the message will be retried
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            attempts = self._conn.execute(
+                "SELECT attempts FROM outbox WHERE id = ?", (message_id,)
+            ).fetchone()[0]
+            retry = retry and attempts < self.max_attempts
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, next_attempt = ?, lease_until = NULL, "
+                "last_error = ?, updated = ? WHERE id = ?",
+                (PENDING if retry else FAILED,
+                 now + self.retry_backoff * 2 ** (attempts - 1), str(error), now, message_id)
+            )
+        return retry
+
+    def stats(self):
+        """Message counts by status (pending/sending/sent/failed)"""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status"))
+        return {status: counts.get(status, 0) for status in (PENDING, SENDING, SENT, FAILED)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class OutboxWorker:
+    """
+    Sends outbox messages on `workers` threads through one shared
+    (pooled) SmtpMailer.
+    """
+
+    def __init__(self, outbox, mailer, workers=2, poll_interval=1.0, log=print):
+        """
+        Args:
+            outbox: Outbox to drain
+            mailer: SmtpMailer used for sending
+            workers: Concurrent sending threads
+            poll_interval: Seconds between checks when the queue is empty
+            log: Callable for progress messages (None = silent)
+        """
+        self.outbox = outbox
+        self.mailer = mailer
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.log = log or (lambda message: None)
+        self.sent = 0
+        self.failed = 0
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._until_empty = False
+        self._threads = []
+
+    def _work(self):
+        while not self._stop.is_set():
+            job = self.outbox.claim()
+            if job is None:
+                if self._until_empty:
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+
+            message_id, msg = job
+            try:
+                outcome = self.mailer.send(msg)
+            except Exception as e:
+                retry = self.outbox.mark_failed(message_id, e, retry=is_transient(e))
+                with self._stats_lock:
+                    self.failed += 1
+                self.log(f"   ❌ {msg['To']}: {e}" + (" (will retry)" if retry else ""))
+            else:
+                self.outbox.mark_sent(message_id, outcome['latency'])
+                with self._stats_lock:
+                    self.sent += 1
+                self.log(f"   📧 Sent to {msg['To']} ({outcome['latency']:.2f}s)")
+
+    def start(self, until_empty=False):
+        """
+        Start the sending threads in the background
+
+        Args:
+            until_empty: Exit once nothing is due instead of waiting for
+                new messages
+        """
+        self._until_empty = until_empty
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"outbox-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stop(self):
+        """Stop after the messages currently being sent"""
+        self._stop.set()
+        self.join()
+
+    def drain(self):
+        """Send everything that's due now, then return"""
+        self.start(until_empty=True)
+        self.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send queued digests from the outbox")
+    parser.add_argument('--watch', action='store_true', help="keep running and send new messages")
+    args = parser.parse_args()
+
+    from news_digest_agent import load_config
+    config = load_config()
+    outbox = Outbox(config['outbox_file'], max_attempts=config['outbox_max_attempts'])
+    mailer = SmtpMailer.from_config(config)
+    worker = OutboxWorker(outbox, mailer, workers=config['delivery_workers'])
+
+    print(f"📮 Outbox: {outbox.stats()}")
+    try:
+        if args.watch:
+            worker.start()
+            while True:
+                time.sleep(3600)
+        else:
+            worker.drain()
+    except KeyboardInterrupt:
+        worker.stop()
+    finally:
+        mailer.close()
+        print(f"📮 Outbox: {outbox.stats()}")
+        outbox.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Preference Store - Per-user FeedbackTracker profiles for many subscribers
+Each user's preferences live in their own SQLite shard under one
+directory, so serving a user never touches anyone else's data. Recently
+used profiles stay open in an LRU; cold ones are opened on demand and
+rank candidates with indexed lookups instead of loading their history.
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from text_utils import safe_name
+from user_feedback import FeedbackTracker, prepare_articles
+
+
+class PreferenceStore:
+    """
+    Multi-user preference store keyed by user id.
+
+    Profiles are FeedbackTrackers over `<directory>/<user>.db`. At most
+    `max_profiles` are kept open; the least recently used one is flushed
+    and closed when another is needed.
+    """
+
+    def __init__(self, directory='user_profiles', max_profiles=128, **tracker_options):
+        """
+        Args:
+            directory: Folder holding one database per user (created if missing)
+            max_profiles: Profiles kept open in memory
+            **tracker_options: Passed to every FeedbackTracker (buffer_size,
+                half_life_days, retention_days, ...)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_profiles = max(1, max_profiles)
+        self.tracker_options = {'cache_history': False, **tracker_options}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, user_id):
+        """Shard file for a user (ids are made filesystem-safe)"""
+        return self.directory / f"{safe_name(user_id)}.db"
+
+    def tracker(self, user_id):
+        """The FeedbackTracker for a user, opened (and created) if needed"""
+        with self._lock:
+            tracker = self._profiles.get(user_id)
+            if tracker is not None:
+                self._profiles.move_to_end(user_id)
+                self.hits += 1
+                return tracker
+
+            self.misses += 1
+            path = self.path_for(user_id)
+            # A legacy <user>.json next to the shard is imported on first open
+            tracker = FeedbackTracker(feedback_file=str(path.with_suffix('.json')),
+                                      db_file=str(path), **self.tracker_options)
+            self._profiles[user_id] = tracker
+            while len(self._profiles) > self.max_profiles:
+                _, evicted = self._profiles.popitem(last=False)
+                evicted.close()
+                self.evictions += 1
+            return tracker
+
+    def log_article_click(self, user_id, article_url, topic, source, sentiment='neutral'):
+        return self.tracker(user_id).log_article_click(article_url, topic, source, sentiment)
+
+    def log_article_feedback(self, user_id, article_url, liked=True):
+        return self.tracker(user_id).log_article_feedback(article_url, liked)
+
+    def personalize(self, user_ids, articles, max_count=5):
+        """
+        Rank one candidate pool for many users
+
+        Args:
+            user_ids: Users to personalize for
+            articles: Shared candidate articles
+            max_count: Articles kept per user
+
+        Returns:
+            Dict of user id -> list of top articles
+        """
+        prepared = prepare_articles(articles)
+        return {
+            user_id: [article for _, article in self.tracker(user_id).rank_prepared(prepared)[:max_count]]
+            for user_id in user_ids
+        }
+
+    def flush(self):
+        """Write queued events of every open profile"""
+        with self._lock:
+            for tracker in self._profiles.values():
+                tracker.flush()
+
+    def stats(self):
+        """Return profile cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            'open_profiles': len(self._profiles),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            while self._profiles:
+                _, tracker = self._profiles.popitem(last=False)
+                tracker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,320 @@
+"""
+Renderer - Precompiled HTML and plain-text digest templates
+The page shell (with its stylesheet) is assembled once at import, and
+templates are split into literal text and field names up front, so
+rendering an article is just appending escaped values between constant
+strings. All pieces go into one list that is joined once, instead of
+growing a string with +=.
+"""
+
+import html
+import string
+from datetime import datetime
+
+
+class Template:
+    """
+    A str.format-style template ({name} fields only) parsed once.
+    render_into() appends its pieces to a list; join the list at the end.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._pieces = tuple(
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(source)
+        )
+
+    def render_into(self, out, values):
+        append = out.append
+        for literal, field in self._pieces:
+            append(literal)
+            if field is not None:
+                append(str(values[field]))
+
+    def render(self, **values):
+        out = []
+        self.render_into(out, values)
+        return ''.join(out)
+
+STYLE = """
+            body { 
+                font-family: Arial, sans-serif; 
+                line-height: 1.6; 
+                color: #333;
+                max-width: 800px;
+                margin: 0 auto;
+                padding: 20px;
+                background-color: #f5f5f5;
+            }
+            .container {
+                background-color: white;
+                padding: 30px;
+                border-radius: 10px;
+                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            }
+            h1 { 
+                color: #2c3e50; 
+                border-bottom: 3px solid #3498db; 
+                padding-bottom: 10px; 
+                margin-bottom: 20px;
+            }
+            h2 { 
+                color: #34495e; 
+                margin-top: 30px;
+                font-size: 1.3em;
+            }
+            .article { 
+                margin: 25px 0; 
+                padding: 20px; 
+                background: linear-gradient(to right, #f8f9fa 0%, #ffffff 100%); 
+                border-left: 5px solid #3498db;
+                border-radius: 5px;
+                box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+            }
+            .source { 
+                color: #7f8c8d; 
+                font-size: 0.9em;
+                margin: 10px 0;
+                font-style: italic;
+            }
+            .preview {
+                color: #555;
+                font-style: italic;
+                margin: 10px 0;
+                padding: 10px;
+                background: #f0f0f0;
+                border-radius: 3px;
+            }
+            .summary {
+                margin: 15px 0;
+                line-height: 1.8;
+                color: #2c3e50;
+            }
+            .summary li {
+                margin: 8px 0;
+            }
+            a { 
+                color: #3498db; 
+                text-decoration: none;
+                font-weight: bold;
+                display: inline-block;
+                margin-top: 10px;
+                padding: 8px 15px;
+                background: #ecf0f1;
+                border-radius: 5px;
+                transition: all 0.3s;
+            }
+            a:hover {
+                background: #3498db;
+                color: white;
+                transform: translateY(-2px);
+            }
+            .footer {
+                margin-top: 40px;
+                padding-top: 20px;
+                border-top: 2px solid #ddd;
+                color: #7f8c8d;
+                font-size: 0.9em;
+                text-align: center;
+            }
+            .badge {
+                display: inline-block;
+                padding: 3px 8px;
+                background: #3498db;
+                color: white;
+                border-radius: 3px;
+                font-size: 0.8em;
+                margin-right: 5px;
+            }
+"""
+
+PAGE_START = """
+    <html>
+    <head>
+        <style>""" + STYLE + """        </style>
+    </head>
+    <body>
+        <div class="container">
+"""
+
+HEADER = Template("""            <h1>📰 Your Daily News Digest</h1>
+            <p><strong>📅 Date:</strong> {today}</p>
+            <p><strong>🏷️ Topics:</strong> {topics}</p>
+            <p><strong>📊 Articles:</strong> {count}</p>
+            <hr>
+""")
+
+ARTICLE = Template("""
+        <div class="article">
+            <h2><span class="badge">#{index}</span> {title}</h2>
+            <p class="source">📍 {source} | 📅 {published}</p>
+        
+            <div class="preview">
+                <strong>Preview:</strong> {description}...
+            </div>
+        
+            <div class="summary">
+                <strong>Key Points:</strong>
+                <div style="margin-top: 10px;">
+                    {bullets}
+                </div>
+            </div>
+        
+            <a href="{url}" target="_blank">🔗 Read Full Article →</a>
+        </div>
+""")
+
+# Streamed digests don't know their length up front: the count goes last
+STREAM_HEADER = Template("""            <h1>📰 Your Daily News Digest</h1>
+            <p><strong>📅 Date:</strong> {today}</p>
+            <p><strong>🏷️ Topics:</strong> {topics}</p>
+            <hr>
+""")
+
+STREAM_COUNT = Template("""
+            <hr>
+            <p><strong>📊 Articles:</strong> {count}</p>
+""")
+
+BULLET_OPEN = '<p style="margin: 5px 0;">• '
+BULLET_CLOSE = '</p>'
+BULLET = BULLET_OPEN + '{}' + BULLET_CLOSE
+
+PAGE_END = """
+        <div class="footer">
+            <p><strong>📱 News Digest Agent</strong></p>
+            <p>CISC691 A03 Project | Powered by NewsAPI</p>
+            <p style="margin-top: 10px; font-size: 0.85em;">
+                Using extractive summarization (no API costs!)
+            </p>
+        </div>
+        </div>
+    </body>
+    </html>
+"""
+
+_format_bullet = BULLET.format
+_escape = html.escape
+
+
+def bullet_lines(summary):
+    """Summary sentences without their '- ' bullet markers"""
+    lines = []
+    for line in (summary or '').splitlines():
+        line = line.strip()
+        if line.startswith('- '):
+            line = line[2:]
+        if line:
+            lines.append(line)
+    return lines
+
+
+def bullets_html(summary):
+    """Summary bullets as HTML paragraphs (summary already escaped)"""
+    # Fast path for the usual "- a\n- b\n- c" layout: C-level replaces
+    if summary.startswith('- ') and summary.count('\n') == summary.count('\n- '):
+        return BULLET_OPEN + summary[2:].replace('\n- ', BULLET_CLOSE + BULLET_OPEN) + BULLET_CLOSE
+    return ''.join([_format_bullet(line) for line in bullet_lines(summary)])
+
+
+def _header_values(summaries, topics, today):
+    return {
+        'today': _escape(today or datetime.now().strftime("%B %d, %Y")),
+        'topics': _escape(', '.join(topics)),
+        'count': len(summaries) if hasattr(summaries, '__len__') else None
+    }
+
+
+def _text(value):
+    """Escaped text of a record field (None renders as empty)"""
+    return _escape(str(value or ''))
+
+
+def _article_values(index, record):
+    url = record['url']
+    if not url or not url.lower().startswith(('http://', 'https://')):
+        url = '#'
+    title, source, published, description, summary, url = map(_text, (
+        record['title'], record['source'], record['published'],
+        record['description'], record['summary'], url
+    ))
+    return {
+        'index': index,
+        'title': title,
+        'source': source,
+        'published': published,
+        'description': description,
+        'bullets': bullets_html(summary),
+        'url': url
+    }
+
+
+def render_html(summaries, topics, today=None):
+    """
+    Build the HTML email digest
+
+    Args:
+        summaries: List of summary_record() dicts
+        topics: Topics shown in the header
+        today: Date string for the header (defaults to today)
+    """
+    out = [PAGE_START]
+    HEADER.render_into(out, _header_values(summaries, topics, today))
+    for index, record in enumerate(summaries, 1):
+        ARTICLE.render_into(out, _article_values(index, record))
+    out.append(PAGE_END)
+    return ''.join(out)
+
+
+def iter_html(summaries, topics, today=None):
+    """
+    Yield the HTML digest one article at a time (for streaming)
+
+    Args:
+        summaries: List of summary_record() dicts, or any iterable of
+            them (e.g. a generator still producing summaries); the
+            article count then follows the last article
+        topics: Topics shown in the header
+        today: Date string for the header (defaults to today)
+    """
+    header = _header_values(summaries, topics, today)
+    if header['count'] is not None:
+        yield PAGE_START + HEADER.render(**header)
+    else:
+        yield PAGE_START + STREAM_HEADER.render(**header)
+
+    index = 0
+    for index, record in enumerate(summaries, 1):
+        yield ARTICLE.render(**_article_values(index, record))
+
+    if header['count'] is None:
+        yield STREAM_COUNT.render(count=index) + PAGE_END
+    else:
+        yield PAGE_END
+
+
+def write_html(summaries, topics, out, today=None):
+    """
+    Write the HTML digest to a file-like object without building one
+    big string (summaries may be a generator, see iter_html())
+    """
+    for chunk in iter_html(summaries, topics, today):
+        out.write(chunk)
+
+
+def render_text(summaries, topics, today=None):
+    """Build the plain-text alternative of the digest"""
+    today = today or datetime.now().strftime("%B %d, %Y")
+    parts = [
+        "📰 Your Daily News Digest\n",
+        f"Date: {today}\n",
+        f"Topics: {', '.join(topics)}\n",
+        f"Articles: {len(summaries)}\n",
+    ]
+    for index, record in enumerate(summaries, 1):
+        parts.append(f"\n#{index} {record['title']}\n")
+        parts.append(f"{record['source']} | {record['published']}\n")
+        parts.extend(f"  • {line}\n" for line in bullet_lines(record['summary']))
+        parts.append(f"Read: {record['url']}\n")
+    parts.append("\n--\nNews Digest Agent | Powered by NewsAPI\n")
+    return ''.join(parts)
@@ -0,0 +1,306 @@
+"""
+Scheduler - Resident digest daemon
+Runs digest jobs on their own schedules inside one long-lived process.
+The NewsAPI fetcher, article and summary caches, SMTP connection pool,
+outbox, archive and search index are built once at startup and shared
+by every run, so a frequent schedule only pays for the new articles
+instead of interpreter startup, .env loading and fresh connections.
+
+schedules.json:
+    [
+        {"name": "morning", "topics": ["artificial intelligence", "robotics"],
+         "every": "day", "at": "07:00", "max_articles": 5},
+        {"name": "markets", "topics": ["stock market"], "every": "hours",
+         "interval": 2, "recipient": "trader@example.com"}
+    ]
+
+Usage:
+    python scheduler.py             # run jobs on schedule until stopped
+    python scheduler.py --run-now   # run every job once at startup too
+    python scheduler.py --status    # show last/next runs of a running daemon
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import traceback
+from datetime import datetime
+
+import schedule
+
+from news_digest_agent import DigestPipeline, load_config, build_fetcher, send_queued
+from article_index import ArticleIndex
+from digest_archive import DigestArchive
+from mailer import SmtpMailer
+from outbox import Outbox
+from summary_cache import SummaryCache
+
+# Units accepted in "every" (schedule.Job attributes)
+UNITS = (
+    'second', 'seconds', 'minute', 'minutes', 'hour', 'hours', 'day', 'days',
+    'week', 'weeks', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+    'saturday', 'sunday'
+)
+
+WEEKDAYS = UNITS[10:]
+SINGULAR_UNITS = ('second', 'minute', 'hour', 'day', 'week') + WEEKDAYS
+
+# Valid "at" times per unit: a time of day for daily and weekday jobs,
+# the minute (":MM") for hourly jobs and the second (":SS") for minutely ones
+AT_FORMATS = {
+    'day': (re.compile(r'^([01]\d|2[0-3]):[0-5]\d(:[0-5]\d)?$'), 'HH:MM'),
+    'hour': (re.compile(r'^:[0-5]\d$'), ':MM'),
+    'minute': (re.compile(r'^:[0-5]\d$'), ':SS'),
+}
+
+# Longest sleep between checks, so the status file and Ctrl+C stay responsive
+MAX_SLEEP = 60
+
+
+def load_jobs(path, config):
+    """
+    Read job definitions, or make one daily job from the .env topics if
+    the file doesn't exist
+
+    Returns:
+        List of dicts with 'name', 'topics', 'max_articles', 'every',
+        'interval', 'at' and 'recipient'
+    """
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    else:
+        entries = [{'name': 'daily', 'topics': config['topics'], 'every': 'day',
+                    'at': config['digest_time']}]
+
+    jobs = []
+    for position, entry in enumerate(entries, 1):
+        every = entry.get('every', 'day')
+        if every not in UNITS:
+            raise ValueError(f"Job {position}: unknown schedule unit '{every}'")
+        topics = [t.strip() for t in entry.get('topics', config['topics']) if t.strip()]
+        if not topics:
+            raise ValueError(f"Job {position}: no topics")
+        name = str(entry.get('name') or f"job{position}")
+        if any(job['name'] == name for job in jobs):
+            raise ValueError(f"Job {position}: duplicate name '{name}'")
+        interval = int(entry.get('interval', 1))
+        if interval < 1:
+            raise ValueError(f"Job {position}: interval must be at least 1")
+        if interval != 1 and every in SINGULAR_UNITS:
+            if every in WEEKDAYS:
+                raise ValueError(f"Job {position}: '{every}' jobs can't have an interval")
+            raise ValueError(f"Job {position}: use '{every}s' with an interval of {interval}")
+        at = entry.get('at')
+        if at:
+            kind = 'day' if every in WEEKDAYS else every.rstrip('s')
+            if kind not in AT_FORMATS:
+                raise ValueError(f"Job {position}: 'at' only works with day, hour, minute "
+                                 f"or weekday schedules, not '{every}'")
+            pattern, example = AT_FORMATS[kind]
+            if not pattern.match(str(at)):
+                raise ValueError(f"Job {position}: 'at' for '{every}' must look like "
+                                 f"'{example}', got '{at}'")
+        jobs.append({
+            'name': name,
+            'topics': topics,
+            'max_articles': int(entry.get('max_articles', config['max_articles'])),
+            'every': every,
+            'interval': interval,
+            'at': at,
+            'recipient': entry.get('recipient')
+        })
+    return jobs
+
+
+def describe(job):
+    """Human-readable schedule of a job, e.g. 'every 2 hours' or 'every day at 07:00'"""
+    every = f"every {job['every']}" if job['interval'] == 1 else f"every {job['interval']} {job['every']}"
+    return f"{every} at {job['at']}" if job['at'] else every
+
+
+class DigestDaemon:
+    """
+    Long-running scheduler for digest jobs, sharing warm clients between
+    runs. Jobs run one after another on the calling thread.
+    """
+
+    def __init__(self, config=None, jobs=None, status_file=None, verbose=True):
+        """
+        Args:
+            config: Dict from load_config() (loaded if None)
+            jobs: List from load_jobs() (read from config['schedule_file'] if None)
+            status_file: JSON file rewritten with job status after each run
+                (default: config['scheduler_status_file'])
+            verbose: Print progress messages (per-stage output included)
+        """
+        self.config = config or load_config()
+        self.jobs = jobs if jobs is not None else load_jobs(self.config['schedule_file'], self.config)
+        self.status_file = status_file or self.config['scheduler_status_file']
+        self.verbose = verbose
+        self.scheduler = schedule.Scheduler()
+        self.status = {}
+        self._scheduled = {}
+
+        # Built once, reused by every run
+        self.fetcher = build_fetcher(self.config)
+        self.summary_cache = SummaryCache() if self.config['summary_cache'] else None
+        self.mailer = SmtpMailer.from_config(self.config)
+        self.outbox = Outbox(self.config['outbox_file'], max_attempts=self.config['outbox_max_attempts'])
+        self.archive = DigestArchive(self.config['archive_file'])
+        self.article_index = ArticleIndex(self.config['article_index_file'])
+
+        for job in self.jobs:
+            scheduled = getattr(self.scheduler.every(job['interval']), job['every'])
+            if job['at']:
+                scheduled = scheduled.at(job['at'])
+            self._scheduled[job['name']] = scheduled.do(self.run_job, job)
+            self.status[job['name']] = {
+                'topics': job['topics'],
+                'schedule': describe(job),
+                'runs': 0,
+                'failures': 0,
+                'last_run': None,
+                'last_duration': None,
+                'last_result': None,
+                'next_run': None
+            }
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def pipeline_for(self, job):
+        """A DigestPipeline for one job run, wired to the shared clients"""
+        # Jobs due at the same time finish within the same second: the job
+        # name keeps their backup files (and archive entries) apart
+        config = dict(self.config, topics=job['topics'], max_articles=job['max_articles'],
+                      digest_suffix=job['name'])
+        if job['recipient']:
+            config['email_recipient'] = job['recipient']
+        return DigestPipeline(
+            config=config,
+            fetcher=self.fetcher,
+            summary_cache=self.summary_cache,
+            mailer=self.mailer,
+            outbox=self.outbox,
+            archive=self.archive,
+            article_index=self.article_index,
+            verbose=self.verbose
+        )
+
+    def run_job(self, job):
+        """Generate, queue and send one job's digest, recording its status"""
+        status = self.status[job['name']]
+        started = datetime.now()
+        start = time.perf_counter()
+        self.log(f"\n⏰ {started:%Y-%m-%d %H:%M:%S} Running '{job['name']}' ({', '.join(job['topics'])})")
+        try:
+            pipeline = self.pipeline_for(job)
+            outcome = pipeline.run()
+            send_queued(pipeline)
+            status['last_result'] = 'queued' if outcome['queued'] else f"not queued: {outcome['error']}"
+        except Exception as e:
+            status['failures'] += 1
+            status['last_result'] = f"error: {e}"
+            self.log(traceback.format_exc())
+        status['runs'] += 1
+        status['last_run'] = started.isoformat(timespec='seconds')
+        status['last_duration'] = round(time.perf_counter() - start, 3)
+        self.log(f"   ⏱️ '{job['name']}' took {status['last_duration']:.2f}s: {status['last_result']}")
+
+    def snapshot(self):
+        """Status of every job, with next run times"""
+        for name, scheduled in self._scheduled.items():
+            next_run = scheduled.next_run
+            self.status[name]['next_run'] = next_run.isoformat(timespec='seconds') if next_run else None
+        return {
+            'pid': os.getpid(),
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'jobs': self.status
+        }
+
+    def write_status(self):
+        snapshot = self.snapshot()
+        temp = self.status_file + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp, self.status_file)
+        return snapshot
+
+    def run_now(self):
+        """Run every job once, immediately"""
+        for job in self.jobs:
+            self.run_job(job)
+        self.write_status()
+
+    def total_runs(self):
+        return sum(info['runs'] for info in self.status.values())
+
+    def run_forever(self):
+        """Run due jobs until interrupted"""
+        for name, info in self.write_status()['jobs'].items():
+            self.log(f"   • {name}: {info['schedule']} (next {info['next_run']})")
+        while True:
+            runs = self.total_runs()
+            self.scheduler.run_pending()
+            # After run_pending, so next_run reflects the rescheduled jobs
+            if self.total_runs() != runs:
+                self.write_status()
+            idle = self.scheduler.idle_seconds
+            time.sleep(MAX_SLEEP if idle is None else min(max(idle, 0.5), MAX_SLEEP))
+
+    def close(self):
+        self.mailer.close()
+        if self.fetcher.cache:
+            self.fetcher.cache.close()
+        self.outbox.close()
+        self.archive.close()
+        self.article_index.close()
+
+
+def print_status(path):
+    if not os.path.exists(path):
+        print(f"No scheduler status at {path} (is the daemon running?)")
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    print(f"📅 Scheduler (pid {snapshot['pid']}), status from {snapshot['updated']}")
+    for name, info in snapshot['jobs'].items():
+        duration = f"{info['last_duration']:.2f}s" if info['last_duration'] is not None else "-"
+        print(f"\n   • {name} [{info['schedule']}]")
+        print(f"     last run: {info['last_run'] or 'never'} ({duration}) {info['last_result'] or ''}")
+        print(f"     next run: {info['next_run']}   runs: {info['runs']}, failures: {info['failures']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run digest jobs on a schedule")
+    parser.add_argument('--schedule', metavar='FILE', help="job definitions (default: $SCHEDULE_FILE)")
+    parser.add_argument('--run-now', action='store_true', help="run every job once at startup")
+    parser.add_argument('--status', action='store_true', help="print the running daemon's status")
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.status:
+        print_status(config['scheduler_status_file'])
+        return
+    if args.schedule:
+        config['schedule_file'] = args.schedule
+
+    print("📅 Starting News Digest scheduler...")
+    daemon = DigestDaemon(config)
+    try:
+        if args.run_now:
+            daemon.run_now()
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Scheduler stopped")
+    finally:
+        daemon.write_status()
+        daemon.close()
+
+
+if __name__ == "__main__":
+    main()
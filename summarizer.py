@@ -0,0 +1,407 @@
+"""
+Summarizer Engines - Extractive summarization back-ends
+    keyword  - original keyword-count scoring (simple_summarize), default
+    textrank - TF-IDF sentence vectors ranked by TextRank centrality
+               (better sentence choice, about 5x slower)
+
+Engines share one interface, summarize_many(texts, num_sentences), so
+a whole batch of articles is tokenized once and corpus statistics (IDF)
+are computed across the batch rather than per article. summarize_batch()
+is the entry point for lists of NewsAPI articles, and can shard large
+batches across a process pool.
+"""
+
+import math
+import re
+from collections import Counter
+
+from text_utils import KeywordMatcher, tokenize
+
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+MIN_TEXT_LENGTH = 50
+MIN_SENTENCE_LENGTH = 20
+
+TOO_SHORT_MESSAGE = "- Article content too short to summarize"
+NO_CONTENT_MESSAGE = "- No content available"
+
+# Batches smaller than this are summarized serially; process start-up and
+# pickling cost more than they save
+PARALLEL_MIN_BATCH = 200
+# Chunks submitted per worker, so uneven articles balance out
+CHUNKS_PER_WORKER = 4
+
+KEYWORDS = ['new', 'first', 'launch', 'announce', 'develop', 'create',
+            'technology', 'ai', 'system', 'company', 'market', 'data',
+            'research', 'study', 'report', 'says', 'according']
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
+
+
+def split_sentences(text):
+    """Split text into candidate sentences (same rules as simple_summarize)"""
+    sentences = (s.strip() for s in SENTENCE_SPLIT_RE.split(text))
+    return [s for s in sentences if len(s) > MIN_SENTENCE_LENGTH]
+
+
+def format_bullets(sentences):
+    """Format sentences as '- ' bullet lines"""
+    return '\n'.join(f"- {sent.strip()}" for sent in sentences)
+
+
+def simple_summarize(text, num_sentences=3):
+    """
+    Simple extractive summarization - picks most important sentences.
+    No OpenAI needed!
+    """
+    if not text or len(text) < MIN_TEXT_LENGTH:
+        return TOO_SHORT_MESSAGE
+
+    # Split into sentences
+    sentences = re.split(r'[.!?]+', text)
+    sentences = [s.strip() for s in sentences if len(s.strip()) > MIN_SENTENCE_LENGTH]
+
+    if len(sentences) == 0:
+        return NO_CONTENT_MESSAGE
+
+    # Score sentences by keyword importance
+    scored_sentences = []
+    for sentence in sentences:
+        score = sum(1 for keyword in KEYWORDS if keyword.lower() in sentence.lower())
+        scored_sentences.append((score, sentence))
+
+    # Sort by score and take top N
+    scored_sentences.sort(reverse=True, key=lambda x: x[0])
+    top_sentences = [s[1] for s in scored_sentences[:num_sentences]]
+
+    # Format as bullet points
+    return format_bullets(top_sentences)
+
+
+class KeywordSummarizer:
+    """
+    The original keyword-count scorer, batched.
+
+    Produces exactly the same summaries as simple_summarize, but uses the
+    precompiled sentence regex and shared keyword table, lowercases each
+    sentence once instead of once per keyword, and only tests the keywords
+    that occur somewhere in the article.
+    """
+
+    name = 'keyword'
+    # Each summary depends only on its own text, so it can be cached
+    batch_dependent = False
+
+    def __init__(self, matcher=KEYWORD_MATCHER):
+        self.matcher = matcher
+
+    def summarize_many(self, texts, num_sentences=3, stats=None):
+        """Summarize a batch of texts (`stats` is unused by this engine)"""
+        return [self._summarize(text, num_sentences) for text in texts]
+
+    def _summarize(self, text, num_sentences):
+        if not text or len(text) < MIN_TEXT_LENGTH:
+            return TOO_SHORT_MESSAGE
+
+        # Only keywords present somewhere in the article can score a sentence
+        present = self.matcher.candidates(text)
+        count = self.matcher.count
+
+        scored_sentences = []
+        for sentence in SENTENCE_SPLIT_RE.split(text):
+            sentence = sentence.strip()
+            if len(sentence) > MIN_SENTENCE_LENGTH:
+                scored_sentences.append((count(sentence, keywords=present), sentence))
+
+        if not scored_sentences:
+            return NO_CONTENT_MESSAGE
+
+        # Stable sort: ties keep document order, as in simple_summarize
+        scored_sentences.sort(reverse=True, key=lambda x: x[0])
+        return format_bullets(s[1] for s in scored_sentences[:num_sentences])
+
+
+class TextRankSummarizer:
+    """
+    Ranks sentences by centrality in a TF-IDF similarity graph.
+
+    Each sentence becomes a sparse, L2-normalised TF-IDF vector (a dict of
+    term -> weight) with IDF computed across the whole batch of articles.
+    Edges are cosine similarities, accumulated through a per-article
+    inverted index so only sentence pairs sharing a term are visited.
+    """
+
+    name = 'textrank'
+    # Summaries depend on the batch's IDF, so they aren't cached
+    batch_dependent = True
+
+    def __init__(self, damping=0.85, max_iterations=30, tolerance=1e-4):
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def prepare(self, text):
+        """
+        Split and tokenize one text
+
+        Returns:
+            (sentences, token_lists), or a message string if the text
+            can't be summarized
+        """
+        if not text or len(text) < MIN_TEXT_LENGTH:
+            return TOO_SHORT_MESSAGE
+        sentences = split_sentences(text)
+        if not sentences:
+            return NO_CONTENT_MESSAGE
+        return sentences, [tokenize(s) for s in sentences]
+
+    @staticmethod
+    def _count_terms(prepared):
+        doc_freq = Counter()
+        n_docs = 0
+        for doc in prepared:
+            if isinstance(doc, str):
+                continue
+            n_docs += 1
+            doc_freq.update({tok for tokens in doc[1] for tok in tokens})
+        return doc_freq, n_docs
+
+    def count_terms(self, texts):
+        """
+        Document frequencies for one chunk of a batch
+
+        Returns:
+            (Counter of term -> number of texts containing it, number of texts)
+        """
+        return self._count_terms(self.prepare(text) for text in texts)
+
+    @staticmethod
+    def stats_from_counts(parts):
+        """
+        Merge count_terms() results from every chunk into corpus statistics
+
+        Returns:
+            Dict with 'idf' (term -> weight) and 'default_idf'
+        """
+        doc_freq = Counter()
+        n_docs = 0
+        for part_freq, part_docs in parts:
+            doc_freq.update(part_freq)
+            n_docs += part_docs
+
+        idf = {
+            term: math.log((1 + n_docs) / (1 + df)) + 1.0
+            for term, df in doc_freq.items()
+        }
+        return {'idf': idf, 'default_idf': math.log(1 + n_docs) + 1.0}
+
+    def corpus_stats(self, prepared):
+        """Compute IDF over a batch of prepared documents (one per article)"""
+        return self.stats_from_counts([self._count_terms(prepared)])
+
+    def fit(self, texts):
+        """Compute corpus statistics for a batch of texts"""
+        return self.corpus_stats([self.prepare(text) for text in texts])
+
+    def summarize_many(self, texts, num_sentences=3, stats=None):
+        """
+        Summarize a batch of texts
+
+        Args:
+            texts: List of article texts
+            num_sentences: Sentences per summary
+            stats: Optional corpus statistics from fit(); computed from
+                `texts` when omitted
+
+        Returns:
+            List of bullet-point summaries, in input order
+        """
+        prepared = [self.prepare(text) for text in texts]
+        if stats is None:
+            stats = self.corpus_stats(prepared)
+
+        summaries = []
+        for doc in prepared:
+            if isinstance(doc, str):
+                summaries.append(doc)
+                continue
+            sentences, token_lists = doc
+            ranked = self.rank_sentences(token_lists, stats)
+            # Present the chosen sentences in their original order
+            chosen = sorted(ranked[:num_sentences])
+            summaries.append(format_bullets(sentences[i] for i in chosen))
+        return summaries
+
+    def rank_sentences(self, token_lists, stats):
+        """
+        Rank the sentences of one document
+
+        Returns:
+            Sentence indices, most central first
+        """
+        n = len(token_lists)
+        if n <= 1:
+            return list(range(n))
+
+        idf = stats['idf']
+        default_idf = stats['default_idf']
+
+        # Sparse TF-IDF vectors, indexed by term
+        postings = {}
+        for i, tokens in enumerate(token_lists):
+            counts = Counter(tokens)
+            weights = {t: c * idf.get(t, default_idf) for t, c in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            if not norm:
+                continue
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((i, weight / norm))
+
+        # Cosine similarity between every pair of sentences sharing a term
+        edges = [dict() for _ in range(n)]
+        for entries in postings.values():
+            if len(entries) < 2:
+                continue
+            for a in range(len(entries)):
+                i, wi = entries[a]
+                for b in range(a + 1, len(entries)):
+                    j, wj = entries[b]
+                    sim = wi * wj
+                    edges[i][j] = edges[i].get(j, 0.0) + sim
+                    edges[j][i] = edges[j].get(i, 0.0) + sim
+
+        out_weight = [sum(e.values()) for e in edges]
+
+        # TextRank power iteration
+        scores = [1.0] * n
+        base = 1.0 - self.damping
+        for _ in range(self.max_iterations):
+            new_scores = [base] * n
+            for j in range(n):
+                if not out_weight[j]:
+                    continue
+                share = self.damping * scores[j] / out_weight[j]
+                for i, sim in edges[j].items():
+                    new_scores[i] += sim * share
+            delta = max(abs(a - b) for a, b in zip(scores, new_scores))
+            scores = new_scores
+            if delta < self.tolerance:
+                break
+
+        # Ties keep document order
+        return sorted(range(n), key=lambda i: (-scores[i], i))
+
+
+SUMMARIZERS = {
+    KeywordSummarizer.name: KeywordSummarizer,
+    TextRankSummarizer.name: TextRankSummarizer,
+}
+
+
+def article_text(article):
+    """Combine an article's description and content for summarizing"""
+    description = article.get('description') or ''
+    content = article.get('content') or ''
+    return f"{description} {content}" if description or content else ""
+
+
+def summarize_batch(articles, num_sentences=3, summarizer=None, workers=1,
+                    chunk_size=None, executor=None, cache=None):
+    """
+    Summarize a whole batch of articles in one pass
+
+    Args:
+        articles: List of NewsAPI article dicts (or plain text strings)
+        num_sentences: Sentences per summary
+        summarizer: Engine from get_summarizer() (default: keyword)
+        workers: Worker processes to shard across (1 = serial)
+        chunk_size: Articles per submitted chunk (default: spread each
+            worker over CHUNKS_PER_WORKER chunks)
+        executor: Optional existing ProcessPoolExecutor to reuse
+        cache: Optional SummaryCache; only texts it doesn't know (and only
+            one copy of each duplicate text) are summarized. Not used for
+            batch-dependent engines (textrank), whose summary of a text
+            changes with the rest of the batch.
+
+    Returns:
+        List of bullet-point summaries, in input order
+    """
+    engine = summarizer or get_summarizer()
+    texts = [a if isinstance(a, str) else article_text(a) for a in articles]
+
+    if cache is None or engine.batch_dependent:
+        return _summarize_texts(engine, texts, num_sentences, workers, chunk_size, executor)
+
+    keys = [cache.make_key(text, engine.name, num_sentences) for text in texts]
+    known = cache.get_many(keys)
+
+    todo = {}
+    for key, text in zip(keys, texts):
+        if key not in known and key not in todo:
+            todo[key] = text
+
+    if todo:
+        fresh = _summarize_texts(engine, list(todo.values()), num_sentences,
+                                 workers, chunk_size, executor)
+        computed = dict(zip(todo, fresh))
+        cache.put_many(computed)
+        known.update(computed)
+
+    return [known[key] for key in keys]
+
+
+def _summarize_texts(engine, texts, num_sentences, workers, chunk_size, executor):
+    """Summarize texts serially, or sharded across processes when worthwhile"""
+    if workers <= 1 or len(texts) < PARALLEL_MIN_BATCH:
+        return engine.summarize_many(texts, num_sentences)
+
+    if not chunk_size:
+        chunk_size = max(1, math.ceil(len(texts) / (workers * CHUNKS_PER_WORKER)))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    if executor is not None:
+        return _summarize_chunks(executor, engine, chunks, num_sentences)
+    # Imported here: multiprocessing is only needed for large batches
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _summarize_chunks(pool, engine, chunks, num_sentences)
+
+
+def _summarize_chunks(pool, engine, chunks, num_sentences):
+    """Run both phases (corpus statistics, then summaries) on the pool"""
+    stats = None
+    if hasattr(engine, 'count_terms'):
+        # Corpus statistics must cover the whole batch, not each shard
+        parts = pool.map(_count_chunk, [engine] * len(chunks), chunks)
+        stats = engine.stats_from_counts(parts)
+
+    results = pool.map(
+        _summarize_chunk,
+        [engine] * len(chunks), chunks,
+        [num_sentences] * len(chunks), [stats] * len(chunks)
+    )
+    # map() yields chunk results in submission order
+    return [summary for chunk in results for summary in chunk]
+
+
+def _count_chunk(engine, texts):
+    return engine.count_terms(texts)
+
+
+def _summarize_chunk(engine, texts, num_sentences, stats):
+    return engine.summarize_many(texts, num_sentences, stats=stats)
+
+
+def get_summarizer(name='keyword'):
+    """
+    Create a summarizer engine by name
+
+    Raises:
+        ValueError: If the name is not a registered engine
+    """
+    try:
+        return SUMMARIZERS[name.strip().lower()]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown summarizer '{name}' (choose from: {', '.join(sorted(SUMMARIZERS))})"
+        ) from None
@@ -0,0 +1,154 @@
+"""
+Summary Cache - Memoized summaries keyed by content hash
+An in-memory LRU in front of a SQLite store, so the same article text
+(overlapping topics, re-fetched articles, repeated app clicks) is only
+summarized once per engine and summary length.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SummaryCache:
+    """
+    Two-level summary cache: memory (LRU, `max_memory_entries`) backed by
+    an on-disk SQLite table capped at `max_disk_entries` rows.
+
+    Keys are SHA-256 hashes of (engine name, sentence count, text), so
+    only engines whose summary depends on the text alone are cached
+    (summarize_batch() skips the cache for textrank, whose IDF comes from
+    the whole batch).
+    """
+
+    def __init__(self, cache_file='summary_cache.db', max_memory_entries=2048,
+                 max_disk_entries=50000):
+        """
+        Args:
+            cache_file: Path to the SQLite database (created if missing)
+            max_memory_entries: Entries kept in the in-memory LRU
+            max_disk_entries: Rows kept on disk (least recently used dropped)
+        """
+        self.cache_file = cache_file
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text, engine_name, num_sentences):
+        """Content hash identifying one summary"""
+        digest = hashlib.sha256()
+        digest.update(f"{engine_name}:{num_sentences}:".encode('utf-8'))
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_many(self, keys):
+        """
+        Look up several summaries at once
+
+        Returns:
+            Dict of key -> summary for the keys that were found
+        """
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            # Query disk in slices to stay under SQLite's parameter limit
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                if rows:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE summaries SET accessed = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows]
+                    )
+                for key, summary in rows:
+                    found[key] = summary
+                    self._remember(key, summary)
+                self.disk_hits += len(rows)
+
+            self._conn.commit()
+            self.misses += len(missing) - sum(1 for key in missing if key in found)
+        return found
+
+    def put_many(self, items):
+        """Store several summaries (dict of key -> summary)"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, summary in items.items():
+                self._remember(key, summary)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, accessed) VALUES (?, ?, ?)",
+                [(key, summary, now) for key, summary in items.items()]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def get(self, key):
+        """Look up one summary (None on a miss)"""
+        return self.get_many([key]).get(key)
+
+    def put(self, key, summary):
+        """Store one summary"""
+        self.put_many({key: summary})
+
+    def _remember(self, key, summary):
+        self._memory[key] = summary
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used rows beyond max_disk_entries"""
+        count = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY accessed LIMIT ?)", (excess,)
+            )
+
+    def stats(self):
+        """Return hit/miss counters"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,104 @@
+"""
+Tests for duplicate and near-duplicate detection (dedupe.py)
+
+Run with: python -m pytest test_dedupe.py
+"""
+
+import random
+
+from dedupe import NearDuplicateIndex, dedupe_articles
+
+WORDS = """
+market energy battery solar chip robot model data policy court vote rocket
+launch orbit climate rain crop bank rate loan startup funding merger lawsuit
+privacy breach satellite vaccine trial drought storm tariff export factory
+""".split()
+
+
+def headline_articles(count, seed=691):
+    """Distinct 8-word headlines with no description"""
+    rng = random.Random(seed)
+    return [{
+        'url': f"https://example.com/{i}",
+        'title': ' '.join(rng.choice(WORDS) for _ in range(7)) + f" item{i}",
+        'description': None
+    } for i in range(count)]
+
+
+def test_headline_length_duplicates_are_caught():
+    originals = headline_articles(40)
+    # Another outlet's copy: new URL, one extra word (Jaccard ~0.88)
+    copies = [dict(article, url=f"https://other.example.org/{i}", title=article['title'] + " update")
+              for i, article in enumerate(originals)]
+
+    index = NearDuplicateIndex()
+    assert all(index.add(article) for article in originals)
+    kept = [article for article in copies if index.add(article)]
+
+    # Candidate pairs are probabilistic; without densified signatures
+    # most headline-length copies were never compared at all
+    assert index.dropped['similar'] >= 36
+    assert len(kept) + index.dropped['similar'] == len(copies)
+
+
+def test_distinct_headlines_are_kept():
+    index = NearDuplicateIndex()
+    articles = headline_articles(200, seed=7)
+    assert all(index.add(article) for article in articles)
+    assert index.dropped['similar'] == 0
+
+
+def test_boilerplate_descriptions_dont_merge_stories():
+    boilerplate = ("Comprehensive up-to-date news coverage, aggregated from sources "
+                   "all over the world by Google News.")
+    paywall = "Subscribe to read the full story. Already a subscriber? Sign in to continue reading."
+    stories = [
+        (boilerplate, "Fed holds interest rates steady amid inflation worries"),
+        (boilerplate, "SpaceX launches new batch of Starlink satellites"),
+        (boilerplate, "Drought threatens wheat harvest across the plains"),
+        (boilerplate, "Court blocks state privacy law pending appeal"),
+        (paywall, "Chipmaker shares jump after record quarterly earnings"),
+        (paywall, "City council approves new downtown transit line"),
+    ]
+    articles = [{'url': f"https://news.example.com/{i}", 'title': title, 'description': description}
+                for i, (description, title) in enumerate(stories)]
+
+    assert len(dedupe_articles(articles)) == len(articles)
+
+
+def test_same_story_with_same_description_is_dropped():
+    description = "The central bank left its benchmark rate unchanged for a third straight meeting on Wednesday."
+    articles = [
+        {'url': 'https://a.example.com/fed', 'title': "Fed holds interest rates steady - Reuters",
+         'source': {'name': 'Reuters'}, 'description': description},
+        {'url': 'https://b.example.com/fed', 'title': "Fed holds interest rates steady again",
+         'source': {'name': 'AP News'}, 'description': description},
+    ]
+    assert len(dedupe_articles(articles)) == 1
+
+
+def test_dash_inside_headline_is_not_an_outlet_suffix():
+    articles = [
+        {'url': 'https://a.example.com/1', 'title': "Stocks - Dow falls 500 points on rate fears",
+         'source': {'name': 'CNBC'}},
+        {'url': 'https://a.example.com/2', 'title': "Stocks - Nasdaq hits record high as chips rally",
+         'source': {'name': 'CNBC'}},
+    ]
+    assert len(dedupe_articles(articles)) == 2
+
+
+def test_outlet_suffix_is_stripped_for_its_source():
+    articles = [
+        {'url': 'https://a.example.com/1', 'title': "Nasdaq hits record high as chips rally - Reuters",
+         'source': {'name': 'Reuters'}},
+        {'url': 'https://b.example.com/2', 'title': "Nasdaq hits record high as chips rally | The Verge",
+         'source': {'name': 'The Verge'}},
+    ]
+    index = NearDuplicateIndex()
+    assert [index.add(article) for article in articles] == [True, False]
+    assert index.dropped['title'] == 1
+
+
+def test_short_titles_are_not_matched_exactly():
+    articles = [{'url': f"https://a.example.com/{i}", 'title': "Live updates"} for i in range(3)]
+    assert len(dedupe_articles(articles)) == 3
@@ -0,0 +1,39 @@
+"""
+Tests for buffered feedback logging (user_feedback.py)
+
+Run with: python -m pytest test_user_feedback.py
+"""
+
+import time
+
+from user_feedback import FeedbackTracker
+
+
+def make_tracker(tmp_path, **kwargs):
+    return FeedbackTracker(str(tmp_path / 'prefs.json'), **kwargs)
+
+
+def test_click_without_topic_or_source_is_logged(tmp_path):
+    tracker = make_tracker(tmp_path)
+    tracker.log_many([{'action': 'clicked', 'url': 'https://example.com/1'}])
+    tracker.log_article_click('https://example.com/2', 'space', 'Reuters')
+
+    assert len(list(tracker.store.iter_interactions())) == 2
+    assert tracker.stats()['queue_depth'] == 0
+    assert None not in tracker.source_scores and None not in tracker.topic_weights
+    assert tracker.source_scores['Reuters'] > 0
+    tracker.close()
+
+
+def test_flush_interval_writes_an_idle_queue(tmp_path):
+    tracker = make_tracker(tmp_path, buffer_size=100, flush_interval=0.1)
+    tracker.log_article_click('https://example.com/1', 'space', 'Reuters')
+    assert tracker.stats()['queue_depth'] == 1
+
+    deadline = time.monotonic() + 5
+    while tracker.stats()['queue_depth'] and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert tracker.stats()['queue_depth'] == 0
+    assert len(list(tracker.store.iter_interactions())) == 1
+    tracker.close()
@@ -0,0 +1,89 @@
+"""
+Text Utilities - Shared tokenizing and text matching helpers
+"""
+
+import hashlib
+import re
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because
+been before being below between both but by can could did do does doing down
+during each few for from further had has have having he her here hers herself
+him himself his how i if in into is it its itself just me more most my myself
+no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then
+there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours
+yourself yourselves said says s t
+""".split())
+
+SAFE_NAME_RE = re.compile(r'[^A-Za-z0-9_.@-]')
+
+
+def safe_name(value):
+    """
+    Filesystem-safe version of an id (e.g. a user id in a file name).
+    Ids that had to be changed get a short hash so they can't collide.
+    """
+    name = SAFE_NAME_RE.sub('_', str(value))
+    if name != str(value) or name.startswith('.'):
+        name = f"{name}-{hashlib.sha1(str(value).encode('utf-8')).hexdigest()[:8]}"
+    return name
+
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed"""
+    return [tok for tok in WORD_RE.findall(text.lower()) if tok not in STOPWORDS]
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords occur (as substrings) in a text.
+
+    Keywords are lowercased once up front, and callers scanning many short
+    pieces of one document (sentences of an article) can narrow the table
+    to the keywords present in the whole document first with candidates().
+    In CPython, C-level `in` substring search over this small table beats
+    both a regex alternation and a pure-Python Aho-Corasick automaton.
+    """
+
+    def __init__(self, keywords):
+        """
+        Args:
+            keywords: Iterable of keyword strings (matched case-insensitively)
+        """
+        self.keywords = tuple(sorted({k.lower() for k in keywords if k}))
+
+    def candidates(self, text, lowered=False):
+        """
+        Keywords that occur anywhere in `text`, as a tuple usable as the
+        `keywords` argument of find()/count() for parts of that text
+        """
+        if not lowered:
+            text = text.lower()
+        return tuple(filter(text.__contains__, self.keywords))
+
+    def find(self, text, lowered=False, keywords=None):
+        """
+        Return the set of keywords contained in `text`
+
+        Args:
+            text: Text to scan
+            lowered: Pass True if `text` is already lowercase
+            keywords: Optional subset from candidates() to test
+        """
+        if not text:
+            return set()
+        if not lowered:
+            text = text.lower()
+        return {k for k in (self.keywords if keywords is None else keywords) if k in text}
+
+    def count(self, text, lowered=False, keywords=None):
+        """Number of distinct keywords contained in `text`"""
+        if not text:
+            return 0
+        if not lowered:
+            text = text.lower()
+        return sum(map(text.__contains__, self.keywords if keywords is None else keywords))
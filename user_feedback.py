@@ -5,47 +5,135 @@ INTEGRATED with news_digest_agent.py
 """
 
 import json
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, date, timedelta
 from pathlib import Path
 from collections import defaultdict
 import os
 
+from feedback_store import FeedbackStore, SOURCE, TOPIC
+from text_utils import KeywordMatcher
+
+# Decayed scores whose magnitude falls below this are dropped by prune()
+MIN_SCORE = 0.01
+
+
+def prepare_articles(articles):
+    """
+    Extract what ranking needs from each article once, so one candidate
+    pool can be ranked for many users without redoing the work
+
+    Returns:
+        List of (article, source name, lowercased title, url) tuples
+    """
+    prepared = []
+    for article in articles:
+        source = article.get('source', {})
+        if isinstance(source, dict):
+            source_name = source.get('name', 'Unknown')
+        else:
+            source_name = source
+        prepared.append((article, source_name, article.get('title', '').lower(), article.get('url')))
+    return prepared
+
+
 class FeedbackTracker:
     """
     Tracks user interactions to enable personalization and adaptation.
     Now with actual functionality to influence article selection!
+
+    Events are stored in an indexed SQLite database (one small transaction
+    per event instead of rewriting a JSON file). Source/topic scores are
+    kept in memory; interactions and read history stay on disk until asked
+    for.
+
+    With buffer_size > 1 events are queued in memory (score changes
+    coalesced per source/topic) and written in one transaction when the
+    queue fills, when flush_interval has passed, on flush()/close() or when
+    leaving a `with FeedbackTracker(...)` block. In-memory scores are
+    always current; only the on-disk copy lags, and a hard crash loses at
+    most the queued events.
+
+    Scores decay exponentially with `half_life_days`, so recent interests
+    outweigh old ones. Each score keeps its value and the time it was last
+    changed; decay is applied when it is read or changed, never by scanning
+    interactions. Per-day score changes are aggregated for windowed views
+    (windowed_scores()), and prune() drops raw history older than the
+    retention window.
     """
     
-    def __init__(self, feedback_file='user_preferences.json'):
+    def __init__(self, feedback_file='user_preferences.json', db_file=None,
+                 buffer_size=1, flush_interval=None, half_life_days=30,
+                 retention_days=None, cache_history=True):
+        """
+        Args:
+            feedback_file: Legacy JSON preferences file, imported once into
+                the database if present
+            db_file: SQLite database (defaults to feedback_file with a .db
+                suffix)
+            buffer_size: Events queued before they're written (1 = write
+                every event immediately)
+            flush_interval: Seconds after which queued events are written,
+                by a background timer if nothing else is logged meanwhile
+                (None = size threshold only)
+            half_life_days: Days for a score to lose half its weight
+                (None = no decay, lifetime counters)
+            retention_days: Prune interactions/history older than this
+                when opening (None = keep everything)
+            cache_history: Keep the set of read URLs in memory for ranking.
+                Without it, each ranking asks the database about just the
+                candidate URLs (better for short-lived profiles).
+        """
         self.feedback_file = feedback_file
-        self.preferences = self._load_preferences()
-    
-    def _load_preferences(self):
-        """Load existing preferences from file"""
-        if Path(self.feedback_file).exists():
-            with open(self.feedback_file, 'r') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    # Handle case where file has line-delimited JSON
-                    return self._migrate_old_format()
-        
-        # Initialize empty preferences structure
-        return {
-            'interactions': [],
-            'source_scores': {},
-            'topic_weights': {},
-            'article_history': [],
-            'metadata': {
-                'created': datetime.now().isoformat(),
-                'total_interactions': 0,
-                'last_updated': None
-            }
+        self.db_file = db_file or str(Path(feedback_file).with_suffix('.db'))
+        self.store = FeedbackStore(self.db_file)
+        if self.store.is_empty() and self.store.get_meta('migrated_from') is None \
+                and Path(self.feedback_file).exists():
+            self._migrate_json()
+        self.half_life_days = half_life_days
+        self.cache_history = cache_history
+        self.retention_days = retention_days
+        self._scores = {
+            SOURCE: self.store.load_scores(SOURCE),
+            TOPIC: self.store.load_scores(TOPIC)
         }
+        self._read_urls = None
+        self._latest_clicks = None
+        self._topic_matcher = None
+        
+        self.buffer_size = max(1, buffer_size)
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._pending_interactions = []
+        self._pending_history = []
+        self._dirty_scores = set()
+        self._pending_daily = {}
+        self._oldest_pending = None
+        self._flush_timer = None
+        self.flushes = 0
+        self.events_flushed = 0
+        self.flush_seconds = 0.0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        
+        if retention_days:
+            self.prune(retention_days)
+    
+    def _migrate_json(self):
+        """One-time import of user_preferences.json into the database"""
+        print(f"📦 Migrating {self.feedback_file} to {self.db_file}...")
+        with open(self.feedback_file, 'r') as f:
+            try:
+                prefs = json.load(f)
+            except json.JSONDecodeError:
+                # Handle case where file has line-delimited JSON
+                prefs = self._migrate_old_format()
+        self.store.import_preferences(prefs, origin=self.feedback_file)
+        print("✅ Migration complete!")
     
     def _migrate_old_format(self):
         """Migrate from line-delimited JSON to structured format"""
-        print("📦 Migrating old feedback format...")
         interactions = []
         
         with open(self.feedback_file, 'r') as f:
@@ -77,58 +165,216 @@ class FeedbackTracker:
             if topic:
                 new_prefs['topic_weights'][topic] = new_prefs['topic_weights'].get(topic, 0) + 1
         
-        self._save_preferences(new_prefs)
-        print("✅ Migration complete!")
         return new_prefs
     
-    def _save_preferences(self, prefs=None):
-        """Save preferences to file"""
-        if prefs is None:
-            prefs = self.preferences
-        
-        prefs['metadata']['last_updated'] = datetime.now().isoformat()
-        
-        with open(self.feedback_file, 'w') as f:
-            json.dump(prefs, f, indent=2)
+    @property
+    def preferences(self):
+        """
+        Full preferences in the legacy user_preferences.json layout.
+        Reads the whole history from disk - for export/debugging only.
+        """
+        self.flush()
+        store = self.store
+        return {
+            'interactions': list(store.iter_interactions()),
+            'source_scores': {name: state[0] for name, state in self._scores[SOURCE].items()},
+            'topic_weights': {name: state[0] for name, state in self._scores[TOPIC].items()},
+            'article_history': list(store.iter_history()),
+            'metadata': {
+                'created': store.get_meta('created'),
+                'total_interactions': int(store.get_meta('total_interactions', 0)),
+                'last_updated': store.get_meta('last_updated')
+            }
+        }
     
-    def log_article_click(self, article_url, topic, source, sentiment='neutral'):
+    @property
+    def read_urls(self):
+        """Set of already-read URLs, loaded from disk on first use"""
+        if self._read_urls is None:
+            self.flush()
+            self._read_urls = self.store.history_urls()
+        return self._read_urls
+    
+    @property
+    def latest_clicks(self):
+        """URL -> (source, topic) of its latest click, loaded from disk on first use"""
+        if self._latest_clicks is None:
+            self.flush()
+            self._latest_clicks = self.store.latest_clicks()
+        return self._latest_clicks
+    
+    def _topic_scan(self):
         """
-        Log when user clicks on an article (indicates interest)
-        
-        Args:
-            article_url: URL of clicked article
-            topic: Article topic category
-            source: News source name
-            sentiment: Optional sentiment indicator
+        Matcher over the known topic names (rebuilt only when a new topic
+        appears) and the combined weight of each lowercased topic
         """
+        topic_weights = self.topic_weights
+        if self._topic_matcher is None:
+            self._topic_matcher = KeywordMatcher(topic_weights)
+        weights = defaultdict(float)
+        for topic, weight in topic_weights.items():
+            weights[topic.lower()] += weight
+        return self._topic_matcher, weights
+    
+    def _decayed(self, state, now):
+        """Value of a [lifetime, decayed, updated] score at time `now`"""
+        if not self.half_life_days:
+            return state[0]
+        return state[1] * 0.5 ** ((now - state[2]) / (self.half_life_days * 86400))
+    
+    def current_scores(self, kind):
+        """Decayed scores of one kind ('source' or 'topic') as of now"""
+        now = time.time()
+        return {name: self._decayed(state, now) for name, state in self._scores[kind].items()}
+    
+    @property
+    def source_scores(self):
+        return self.current_scores(SOURCE)
+    
+    @property
+    def topic_weights(self):
+        return self.current_scores(TOPIC)
+    
+    def _adjust(self, kind, name, delta):
+        """Apply a score change in memory and queue it for disk"""
+        now = time.time()
+        scores = self._scores[kind]
+        state = scores.get(name)
+        if state is None:
+            if kind == TOPIC:
+                self._topic_matcher = None
+            state = scores[name] = [0, 0.0, now]
+        state[1] = self._decayed(state, now) + delta
+        state[0] += delta
+        state[2] = now
+        self._dirty_scores.add((kind, name))
+        
+        # Roll the change into today's aggregate
+        daily = self._pending_daily.setdefault((date.today().isoformat(), kind, name), [0, 0.0])
+        daily[0] += 1
+        daily[1] += delta
+    
+    def _queue(self, interaction):
+        self._pending_interactions.append(interaction)
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+            if self.flush_interval is not None:
+                # Writes the queue even if the tracker goes idle
+                self._flush_timer = threading.Timer(self.flush_interval, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _timed_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            # The queue is kept; the next log call or flush() retries
+            print(f"⚠️  Background feedback flush failed: {e}")
+    
+    def _cancel_timer(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+    
+    def _record_click(self, article_url, topic, source, sentiment='neutral'):
+        now = datetime.now().isoformat()
         interaction = {
             'url': article_url,
             'topic': topic,
             'source': source,
             'sentiment': sentiment,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'action': 'clicked'
         }
         
-        # Update preferences
-        self.preferences['interactions'].append(interaction)
-        self.preferences['metadata']['total_interactions'] += 1
+        self._queue(interaction)
+        # Positive feedback for the source, increased interest in the topic
+        if source:
+            self._adjust(SOURCE, source, 1)
+        if topic:
+            self._adjust(TOPIC, topic, 1)
+        self._pending_history.append((article_url, now))
+        if self._read_urls is not None:
+            self._read_urls.add(article_url)
+        if self._latest_clicks is not None:
+            self._latest_clicks[article_url] = (source, topic)
+        return interaction
+    
+    def _record_feedback(self, article_url, liked):
+        interaction = {
+            'url': article_url,
+            'timestamp': datetime.now().isoformat(),
+            'action': 'liked' if liked else 'disliked'
+        }
         
-        # Update source score (positive feedback)
-        self.preferences['source_scores'][source] = \
-            self.preferences['source_scores'].get(source, 0) + 1
+        # Source/topic come from the latest click on this URL
+        clicked = self.latest_clicks.get(article_url)
         
-        # Update topic weight (increase interest)
-        self.preferences['topic_weights'][topic] = \
-            self.preferences['topic_weights'].get(topic, 0) + 1
+        self._queue(interaction)
+        if clicked:
+            source, topic = clicked
+            delta = 2 if liked else -1
+            if source:
+                self._adjust(SOURCE, source, delta)
+            if topic:
+                self._adjust(TOPIC, topic, delta)
+        return interaction
+    
+    def _maybe_flush(self):
+        """Flush if the queue reached buffer_size or is older than flush_interval"""
+        if len(self._pending_interactions) >= self.buffer_size:
+            self.flush()
+        elif self.flush_interval is not None and self._oldest_pending is not None \
+                and time.monotonic() - self._oldest_pending >= self.flush_interval:
+            self.flush()
+    
+    def flush(self):
+        """
+        Write all queued events in one transaction. On failure nothing is
+        written and the queue is kept for the next attempt.
         
-        # Add to history
-        self.preferences['article_history'].append({
-            'url': article_url,
-            'read_date': datetime.now().isoformat()
-        })
+        Returns:
+            Number of interactions written
+        """
+        with self._lock:
+            count = len(self._pending_interactions)
+            if not count and not self._dirty_scores:
+                return 0
+            start = time.perf_counter()
+            scores = {
+                (kind, name): tuple(self._scores[kind][name])
+                for kind, name in self._dirty_scores
+            }
+            self.store.write_batch(self._pending_interactions, self._pending_history,
+                                   scores, self._pending_daily)
+            elapsed = time.perf_counter() - start
+            
+            self._pending_interactions = []
+            self._pending_history = []
+            self._dirty_scores = set()
+            self._pending_daily = {}
+            self._oldest_pending = None
+            self._cancel_timer()
+            self.flushes += 1
+            self.events_flushed += count
+            self.flush_seconds += elapsed
+            self.last_flush_seconds = elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+            return count
+    
+    def log_article_click(self, article_url, topic, source, sentiment='neutral'):
+        """
+        Log when user clicks on an article (indicates interest)
         
-        self._save_preferences()
+        Args:
+            article_url: URL of clicked article
+            topic: Article topic category
+            source: News source name
+            sentiment: Optional sentiment indicator
+        """
+        with self._lock:
+            interaction = self._record_click(article_url, topic, source, sentiment)
+            self._maybe_flush()
         
         print(f"✓ Logged interest in {topic} from {source}")
         return interaction
@@ -141,54 +387,119 @@ class FeedbackTracker:
             article_url: Article URL
             liked: True if positive feedback, False if negative
         """
-        feedback_type = 'liked' if liked else 'disliked'
+        with self._lock:
+            interaction = self._record_feedback(article_url, liked)
+            self._maybe_flush()
         
-        interaction = {
-            'url': article_url,
-            'timestamp': datetime.now().isoformat(),
-            'action': feedback_type
-        }
-        
-        self.preferences['interactions'].append(interaction)
-        self.preferences['metadata']['total_interactions'] += 1
-        
-        # Find article in history to get source/topic
-        for hist_article in reversed(self.preferences['interactions']):
-            if hist_article.get('url') == article_url:
-                source = hist_article.get('source')
-                topic = hist_article.get('topic')
-                
-                if source:
-                    # Adjust source score
-                    delta = 2 if liked else -1
-                    self.preferences['source_scores'][source] = \
-                        self.preferences['source_scores'].get(source, 0) + delta
-                
-                if topic:
-                    # Adjust topic weight
-                    delta = 2 if liked else -1
-                    self.preferences['topic_weights'][topic] = \
-                        self.preferences['topic_weights'].get(topic, 0) + delta
-                
-                break
-        
-        self._save_preferences()
         print(f"{'👍' if liked else '👎'} Feedback recorded for {article_url[:50]}...")
         return interaction
     
+    def log_many(self, events):
+        """
+        Log a burst of events. They're queued together and written in one
+        transaction once the buffer thresholds are reached (immediately for
+        an unbuffered tracker).
+        
+        Args:
+            events: Iterable of dicts with 'action' ('clicked', 'liked' or
+                'disliked') and 'url'; clicks also take 'topic', 'source'
+                and optionally 'sentiment'
+        
+        Returns:
+            List of recorded interactions
+        """
+        interactions = []
+        with self._lock:
+            for event in events:
+                action = event.get('action')
+                if action == 'clicked':
+                    interactions.append(self._record_click(
+                        event['url'], event.get('topic'), event.get('source'),
+                        event.get('sentiment', 'neutral')
+                    ))
+                elif action in ('liked', 'disliked'):
+                    interactions.append(self._record_feedback(event['url'], action == 'liked'))
+                else:
+                    raise ValueError(f"Unknown feedback action '{action}'")
+            self._maybe_flush()
+        
+        print(f"✓ Logged {len(interactions)} interactions")
+        return interactions
+    
+    def stats(self):
+        """Return queue depth and flush latency counters"""
+        return {
+            'queue_depth': len(self._pending_interactions),
+            'pending_scores': len(self._dirty_scores),
+            'flushes': self.flushes,
+            'events_flushed': self.events_flushed,
+            'last_flush_ms': self.last_flush_seconds * 1000,
+            'avg_flush_ms': self.flush_seconds * 1000 / self.flushes if self.flushes else 0.0,
+            'max_flush_ms': self.max_flush_seconds * 1000
+        }
+    
+    def windowed_scores(self, kind, days=7):
+        """
+        Plain (undecayed) score change per source/topic over the last
+        `days` days, from the per-day aggregates
+        
+        Args:
+            kind: 'source' or 'topic'
+            days: Window length, today included
+        """
+        self.flush()
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        return self.store.window_scores(kind, since)
+    
+    def prune(self, retention_days):
+        """
+        Drop interactions, read history and daily aggregates older than
+        `retention_days`, plus scores that decayed to nothing and haven't
+        changed since. Freed database pages are reused, so the file stops
+        growing once the window is full.
+        
+        Returns:
+            Dict of what was deleted -> count
+        """
+        with self._lock:
+            self.flush()
+            cutoff = datetime.now() - timedelta(days=retention_days)
+            deleted = self.store.prune(cutoff.isoformat())
+            
+            cutoff_ts = cutoff.timestamp()
+            now = time.time()
+            stale = [
+                (kind, name) for kind, scores in self._scores.items()
+                for name, state in scores.items()
+                if state[2] < cutoff_ts and abs(self._decayed(state, now)) < MIN_SCORE
+            ]
+            if stale:
+                self.store.delete_scores(stale)
+                for kind, name in stale:
+                    del self._scores[kind][name]
+                self._topic_matcher = None
+            deleted['scores'] = len(stale)
+            
+            # Rebuilt from what's left on next use
+            self._read_urls = None
+            self._latest_clicks = None
+            return deleted
+    
     def get_source_score(self, source_name):
         """
         Get preference score for a news source
         Higher = user prefers this source
         """
-        return self.preferences['source_scores'].get(source_name, 0)
+        state = self._scores[SOURCE].get(source_name)
+        return self._decayed(state, time.time()) if state else 0
     
     def get_topic_weight(self, topic):
         """
         Get interest weight for a topic
         Higher = user more interested in this topic
         """
-        return self.preferences['topic_weights'].get(topic, 1)  # Default weight = 1
+        state = self._scores[TOPIC].get(topic)
+        return self._decayed(state, time.time()) if state else 1  # Default weight = 1
     
     def rank_articles(self, articles):
         """
@@ -197,33 +508,41 @@ class FeedbackTracker:
         Args:
             articles: List of article dicts with 'source', 'title', 'url'
         
+        Returns:
+            List of (score, article) tuples sorted by score (highest first)
+        """
+        return self.rank_prepared(prepare_articles(articles))
+    
+    def _read_among(self, urls):
+        """Which of `urls` were already read"""
+        if self.cache_history or self._read_urls is not None:
+            return self.read_urls
+        self.flush()
+        return self.store.read_among(urls)
+    
+    def rank_prepared(self, prepared):
+        """
+        Rank articles from prepare_articles()
+        
         Returns:
             List of (score, article) tuples sorted by score (highest first)
         """
         scored_articles = []
+        already_read = self._read_among([url for _, _, _, url in prepared])
+        source_scores = self.source_scores
+        topic_matcher, topic_weights = self._topic_scan()
         
-        for article in articles:
-            score = 0
-            source = article.get('source', {})
-            if isinstance(source, dict):
-                source_name = source.get('name', 'Unknown')
-            else:
-                source_name = source
-            
+        for article, source_name, title, url in prepared:
             # Score based on source preference
-            source_score = self.get_source_score(source_name)
-            score += source_score * 10  # Weight source heavily
+            score = source_scores.get(source_name, 0) * 10  # Weight source heavily
             
             # Score based on topic (would need topic extraction in real implementation)
             # For now, check if article title contains any known topics
-            title = article.get('title', '').lower()
-            for topic, weight in self.preferences['topic_weights'].items():
-                if topic.lower() in title:
-                    score += weight * 5
+            for topic in topic_matcher.find(title, lowered=True):
+                score += topic_weights[topic] * 5
             
             # Penalize already-read articles
-            url = article.get('url')
-            if any(h['url'] == url for h in self.preferences['article_history']):
+            if url in already_read:
                 score -= 100  # Strong penalty for duplicates
             
             scored_articles.append((score, article))
@@ -249,7 +568,10 @@ class FeedbackTracker:
     
     def generate_insights_report(self):
         """Generate human-readable insights about user preferences"""
-        prefs = self.preferences
+        self.flush()
+        store = self.store
+        total_interactions = int(store.get_meta('total_interactions', 0))
+        last_updated = store.get_meta('last_updated') or 'Never'
         
         report = f"""
 ╔══════════════════════════════════════════════════════════╗
@@ -257,47 +579,49 @@ class FeedbackTracker:
 ╚══════════════════════════════════════════════════════════╝
 
 🎯 Activity Summary:
-   • Total Interactions: {prefs['metadata']['total_interactions']}
-   • Articles Read: {len(prefs['article_history'])}
-   • Last Updated: {prefs['metadata'].get('last_updated', 'Never')[:10]}
+   • Total Interactions: {total_interactions}
+   • Articles Read: {store.history_count()}
+   • Last Updated: {last_updated[:10]}
+   • Score Half-Life: {f'{self.half_life_days} days' if self.half_life_days else 'none'}
 
 📰 Top Preferred Sources:
 """
         # Sort sources by score
         top_sources = sorted(
-            prefs['source_scores'].items(),
+            self.source_scores.items(),
             key=lambda x: x[1],
             reverse=True
         )[:5]
         
         for source, score in top_sources:
-            bar = '█' * min(score, 20)
-            report += f"   • {source:<20} {bar} ({score})\n"
+            bar = '█' * max(0, min(round(score), 20))
+            report += f"   • {source:<20} {bar} ({score:.1f})\n"
         
         report += "\n🏷️  Topic Interests:\n"
         top_topics = sorted(
-            prefs['topic_weights'].items(),
+            self.topic_weights.items(),
             key=lambda x: x[1],
             reverse=True
         )[:5]
         
         for topic, weight in top_topics:
-            bar = '█' * min(weight, 20)
-            report += f"   • {topic:<20} {bar} ({weight})\n"
+            bar = '█' * max(0, min(round(weight), 20))
+            report += f"   • {topic:<20} {bar} ({weight:.1f})\n"
         
         # Recent activity
-        if prefs['interactions']:
+        recent = store.recent_interactions(3)
+        if recent:
             report += f"\n🕒 Recent Activity:\n"
-            for interaction in prefs['interactions'][-3:]:
+            for interaction in recent:
                 action = interaction.get('action', 'unknown')
                 timestamp = interaction.get('timestamp', '')[:10]
                 topic = interaction.get('topic', 'N/A')
                 report += f"   • {timestamp} - {action} ({topic})\n"
         
         report += "\n💡 Personalization Status: "
-        if prefs['metadata']['total_interactions'] > 10:
+        if total_interactions > 10:
             report += "✅ ACTIVE (Agent is learning your preferences)\n"
-        elif prefs['metadata']['total_interactions'] > 0:
+        elif total_interactions > 0:
             report += "🔄 LEARNING (Keep interacting to improve)\n"
         else:
             report += "⭕ NOT STARTED (No interactions yet)\n"
@@ -320,6 +644,19 @@ class FeedbackTracker:
             score, _ = scored[0]
             return score >= threshold
         return True  # Include by default if no preference data
+    
+    def close(self):
+        """Write queued events and close the database"""
+        with self._lock:
+            self._cancel_timer()
+            self.flush()
+            self.store.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 # ═══════════════════════════════════════════════════════════
 #  DEMO & TESTING
@@ -372,7 +709,8 @@ def demo_feedback_system():
     print(tracker.generate_insights_report())
     
     print("\n✅ Demo Complete!")
-    print(f"📁 Preferences saved to: {tracker.feedback_file}")
+    print(f"📁 Preferences saved to: {tracker.db_file}")
+    tracker.close()
 
 if __name__ == "__main__":
     demo_feedback_system()
\ No newline at end of file